@@ -3,33 +3,41 @@
 from models.amenity import Amenity
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.cache import cached
+from api.v1.views.conditional import conditional
+from api.v1.views.paging import field_args, jsonify_page, page_args
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/amenity/all_amenities.yml')
+@conditional(Amenity)
+@cached(Amenity)
 def get_amenities():
     """
-    Retrieves a list of all amenities
+    Retrieves a list of all amenities, a page of them when limit or
+    after is given
     """
-    all_amenities = storage.all(Amenity).values()
-    list_amenities = []
-    for amenity in all_amenities:
-        list_amenities.append(amenity.to_dict())
-    return jsonify(list_amenities)
+    order_by, after, limit = page_args(request.args, cursor="after")
+    fields = field_args(request.args)
+    all_amenities = storage.all(Amenity, order_by, after,
+                                limit and limit + 1, fields).values()
+    return jsonify_page(all_amenities, order_by, limit, fields)
 
 
 @app_views.route('/amenities/<amenity_id>/', methods=['GET'],
                  strict_slashes=False)
 @swag_from('documentation/amenity/get_amenity.yml', methods=['GET'])
+@conditional(Amenity)
 def get_amenity(amenity_id):
     """ Retrieves an amenity """
-    amenity = storage.get(Amenity, amenity_id)
+    fields = field_args(request.args)
+    amenity = storage.get(Amenity, amenity_id, fields)
     if not amenity:
         abort(404)
 
-    return jsonify(amenity.to_dict())
+    return jsonify(amenity.to_dict(fields=fields))
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'],
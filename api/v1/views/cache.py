@@ -0,0 +1,248 @@
+#!/usr/bin/python3
+""" caches of the responses and results of read-heavy views """
+from api.v1.views.conditional import class_versions
+from collections import OrderedDict
+from functools import wraps
+import hashlib
+import json
+import models
+import os
+import tempfile
+import threading
+from flask import current_app, make_response, request
+
+# headers of a response kept in the cache along with its body
+kept_headers = ("Content-Type", "Link", "X-Next-Cursor")
+
+
+class MemoryCache:
+    """least recently used responses, kept in the memory of the process"""
+
+    def __init__(self, size):
+        """Instantiate a cache of at most size bytes of keys and bodies"""
+        self.size = size
+        self.__lock = threading.Lock()
+        # entries by key, from the least to the most recently used
+        self.__entries = OrderedDict()
+        # bytes of the keys and bodies of the entries
+        self.__used = 0
+
+    def get(self, key):
+        """returns the entry of key, or None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        """keeps entry under key, dropping the least recently used ones"""
+        with self.__lock:
+            old = self.__entries.pop(key, None)
+            if old is not None:
+                self.__used -= len(key) + len(old[3])
+            self.__entries[key] = entry
+            self.__used += len(key) + len(entry[3])
+            while self.__used > self.size:
+                old_key, old = self.__entries.popitem(last=False)
+                self.__used -= len(old_key) + len(old[3])
+
+    def clear(self):
+        """drops every entry"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__used = 0
+
+
+class DirectoryCache:
+    """
+    least recently used responses, kept as files of a directory shared by
+    the workers of a host (one in /dev/shm stays in memory)
+    """
+
+    def __init__(self, path, size):
+        """Instantiate a cache of at most size bytes of bodies in path"""
+        self.path = path
+        self.size = size
+        os.makedirs(path, exist_ok=True)
+
+    def get(self, key):
+        """returns the entry of key, or None"""
+        name = self.__file(key)
+        try:
+            with open(name, "rb") as f:
+                head = json.loads(f.readline())
+                body = f.read()
+            os.utime(name)
+        except (OSError, ValueError):
+            return None
+        tags, status, headers = head
+        return tags, status, [tuple(h) for h in headers], body
+
+    def put(self, key, entry):
+        """keeps entry under key, dropping the least recently used ones"""
+        tags, status, headers, body = entry
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps([tags, status, headers]).encode() + b"\n")
+            f.write(body)
+        os.replace(tmp, self.__file(key))
+        self.__prune()
+
+    def clear(self):
+        """drops every entry"""
+        for name in os.listdir(self.path):
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+
+    def __file(self, key):
+        """returns the name of the file of the entry of key"""
+        return os.path.join(self.path, hashlib.sha1(key.encode()).hexdigest())
+
+    def __prune(self):
+        """removes the least recently used files past size bytes"""
+        files = []
+        for entry in os.scandir(self.path):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        used = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if used <= self.size:
+                break
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+            used -= size
+
+
+class ResultCache:
+    """
+    least recently used results of computations kept by key, each
+    computed by a single thread at a time: others asking for the same
+    result wait for it instead of computing it again
+    """
+
+    def __init__(self, size):
+        """Instantiate a cache of at most size results (none when 0)"""
+        self.size = size
+        self.__lock = threading.Lock()
+        # (tags, result) by key, from the least to the most recently used
+        self.__entries = OrderedDict()
+        # event set once the result of (key, tags) is computed, by the
+        # (key, tags) being computed, and the result or None if it failed
+        self.__flights = {}
+
+    def run(self, key, tags, compute):
+        """
+        returns the result of key kept with tags, else the one computed
+        by compute() (by this thread or another one asking at the time)
+        """
+        tags = tuple(tags)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] == tags:
+                self.__entries.move_to_end(key)
+                return entry[1]
+            flight = self.__flights.get((key, tags))
+            if flight is None:
+                flight = self.__flights[(key, tags)] = [threading.Event(),
+                                                        None]
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            flight[0].wait()
+            if flight[1] is not None:
+                return flight[1][0]
+            return compute()
+        try:
+            result = compute()
+            flight[1] = (result,)
+        finally:
+            with self.__lock:
+                del self.__flights[(key, tags)]
+                if flight[1] is not None and self.size > 0:
+                    self.__entries.pop(key, None)
+                    self.__entries[key] = (tags, result)
+                    while len(self.__entries) > self.size:
+                        self.__entries.popitem(last=False)
+            flight[0].set()
+        return result
+
+    def clear(self):
+        """drops every result"""
+        with self.__lock:
+            self.__entries.clear()
+
+
+def make_cache():
+    """
+    returns the response cache set in the environment: HBNB_API_CACHE_MB
+    megabytes of entries (none when 0), in the directory HBNB_API_CACHE_DIR
+    when set and the tags of storage are the same in every process (with
+    the database engines), else in memory
+    """
+    size = int(float(os.getenv("HBNB_API_CACHE_MB", 64)) * 2 ** 20)
+    if size <= 0:
+        return None
+    path = os.getenv("HBNB_API_CACHE_DIR")
+    if path and models.storage_t == "db":
+        return DirectoryCache(path, size)
+    return MemoryCache(size)
+
+
+responses = make_cache()
+# ids of the places found by places_search, by normalized search, for up
+# to HBNB_SEARCH_CACHE_SIZE searches
+searches = ResultCache(int(os.getenv("HBNB_SEARCH_CACHE_SIZE", 1024)))
+
+
+def request_key():
+    """
+    returns the key of the current request: its method and URL, its
+    query arguments in sorted order, and its JSON body with sorted keys;
+    None if the body is not JSON
+    """
+    args = sorted(request.args.items(multi=True))
+    key = [request.method, request.base_url, args]
+    if request.method == "POST":
+        data = request.get_json(silent=True)
+        if data is None:
+            return None
+        key.append(data)
+    return json.dumps(key, sort_keys=True)
+
+
+def cached(*classes):
+    """
+    Returns a decorator of views answering with objects of classes: their
+    200 responses are kept in the cache and served again to the same
+    request until an object of classes is added, changed or deleted
+    """
+    def decorator(view):
+        """wraps view"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """answers from the cache if it is current, else the view"""
+            key = request_key() if responses is not None else None
+            if key is None:
+                return view(*args, **kwargs)
+            tags = [tag for tag, _ in class_versions(classes)]
+            entry = responses.get(key)
+            if entry is not None and entry[0] == tags:
+                _, status, headers, body = entry
+                return current_app.response_class(body, status, headers)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.direct_passthrough:
+                headers = [(name, value) for name, value in response.headers
+                           if name in kept_headers]
+                responses.put(key, (tags, 200, headers, response.get_data()))
+            return response
+        return wrapper
+    return decorator
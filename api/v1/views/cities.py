@@ -4,6 +4,9 @@ from models.city import City
 from models.state import State
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.cache import cached
+from api.v1.views.conditional import conditional
+from api.v1.views.paging import field_args, jsonify_page, page_args
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -11,31 +14,37 @@ from flasgger.utils import swag_from
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
 @swag_from('documentation/city/cities_by_state.yml', methods=['GET'])
+@conditional(State, City)
+@cached(State, City)
 def get_cities(state_id):
     """
     Retrieves the list of all cities objects
-    of a specific State, or a specific city
+    of a specific State, or a specific city, a page of them when limit
+    or after is given
     """
-    list_cities = []
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    for city in state.cities:
-        list_cities.append(city.to_dict())
+    order_by, after, limit = page_args(request.args, cursor="after")
+    fields = field_args(request.args)
+    cities = storage.related(City, "state_id", state.id, order_by, after,
+                             limit and limit + 1, fields)
 
-    return jsonify(list_cities)
+    return jsonify_page(cities, order_by, limit, fields)
 
 
 @app_views.route('/cities/<city_id>/', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/city/get_city.yml', methods=['GET'])
+@conditional(City)
 def get_city(city_id):
     """
     Retrieves a specific city based on id
     """
-    city = storage.get(City, city_id)
+    fields = field_args(request.args)
+    city = storage.get(City, city_id, fields)
     if not city:
         abort(404)
-    return jsonify(city.to_dict())
+    return jsonify(city.to_dict(fields=fields))
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'], strict_slashes=False)
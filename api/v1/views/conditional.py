@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+""" conditional GET of the objects returned by views """
+from datetime import datetime, timezone
+from functools import wraps
+import hashlib
+from flask import current_app, g, make_response, request
+from models import storage
+
+
+def class_versions(classes):
+    """
+    Returns the (tag, time of the last change) versions of classes in
+    storage, each read once per request
+    """
+    known = g.setdefault("class_versions", {})
+    for cls in classes:
+        if cls not in known:
+            known[cls] = storage.version(cls)
+    return [known[cls] for cls in classes]
+
+
+def validators(classes):
+    """
+    Returns the ETag and the Last-Modified time of the response to the
+    current request, from the versions of classes in storage; the time
+    is None until the second of the last change is over, as a change
+    later in that second would have the same Last-Modified
+    """
+    tags = [request.full_path]
+    modified = None
+    for tag, changed in class_versions(classes):
+        tags.append(tag)
+        if modified is None or changed > modified:
+            modified = changed
+    etag = hashlib.sha1("\n".join(tags).encode()).hexdigest()
+    modified = modified.replace(microsecond=0)
+    if modified >= datetime.utcnow().replace(microsecond=0):
+        return etag, None
+    return etag, modified.replace(tzinfo=timezone.utc)
+
+
+def conditional(*classes):
+    """
+    Returns a decorator of GET views answering with objects of classes:
+    their responses get an ETag and a Last-Modified header, and requests
+    whose If-None-Match or If-Modified-Since header matches them get a
+    304 before the view runs
+    """
+    def decorator(view):
+        """wraps view"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """answers 304 if the client's copy is current, else the view"""
+            etag, modified = validators(classes)
+            if request.if_none_match:
+                fresh = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                fresh = (since is not None and modified is not None and
+                         modified <= since)
+            if fresh:
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(etag)
+                if modified is not None:
+                    response.last_modified = modified
+            return response
+        return wrapper
+    return decorator
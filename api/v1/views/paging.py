@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+""" keyset pagination and projection of the objects returned by views """
+import base64
+import binascii
+from datetime import datetime
+import json
+from flask import abort, jsonify, request
+from models.base_model import format_time, parse_time
+from urllib.parse import urlencode
+
+# the type of the values of the attributes views order by, written in
+# their cursors (timestamps as strings)
+order_types = {"id": str, "name": str, "number_rooms": int,
+               "number_bathrooms": int, "max_guest": int,
+               "price_by_night": int, "created_at": datetime,
+               "updated_at": datetime}
+
+
+def encode_cursor(order_by, obj):
+    """
+    Returns the opaque cursor of the page that follows obj: the order,
+    and the value of the order attribute and the id of obj
+    """
+    value = getattr(obj, order_by.lstrip("-"), None)
+    if isinstance(value, datetime):
+        value = format_time(value)
+    data = json.dumps([order_by, value, obj.id]).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Returns the order and the (value, id) written in cursor,
+    aborting with 400 if it is not a cursor or its value or id is not of
+    the type of its attribute
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        order_by, value, id = json.loads(data)
+        typ = order_types[order_by.lstrip("-")]
+        if typ is datetime and value is not None:
+            value = parse_time(value)
+        if type(id) is not str or (value is not None and
+                                   type(value) is not typ):
+            raise ValueError("cursor of the wrong types")
+    except (AttributeError, KeyError, TypeError, ValueError,
+            binascii.Error):
+        abort(400, description="Invalid cursor")
+    return order_by, (value, id)
+
+
+def page_args(args, fields=("id",), cursor="cursor"):
+    """
+    Returns the order_by, after and limit asked for in args, aborting
+    with 400 on bad values. order_by, an attribute of fields or one
+    prefixed with "-" for a descending order, defaults to that of the
+    cursor (the value of the key cursor of args), then to id when a
+    limit is given
+    """
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if limit < 1:
+            abort(400, description="Invalid limit")
+    order_by = args.get('order_by')
+    after = None
+    if args.get(cursor) is not None:
+        cursor_order, after = decode_cursor(args.get(cursor))
+        if order_by is None:
+            order_by = cursor_order
+        elif order_by != cursor_order:
+            abort(400, description="Cursor does not match order_by")
+    if order_by is None and limit is not None:
+        order_by = "id"
+    if order_by is not None and (not isinstance(order_by, str) or
+                                 order_by.lstrip("-") not in fields):
+        abort(400, description="Invalid order_by")
+    return order_by, after, limit
+
+
+def field_args(args):
+    """
+    Returns the list of attributes named by fields in args, a list or
+    a string of comma separated names, or None if not given, aborting
+    with 400 on bad values
+    """
+    fields = args.get('fields')
+    if fields is None or fields == "":
+        return None
+    if isinstance(fields, str):
+        fields = [name for name in fields.split(",") if name]
+    if not isinstance(fields, list) or not all(
+            isinstance(name, str) for name in fields):
+        abort(400, description="Invalid fields")
+    return fields
+
+
+def split_page(objs, order_by, limit):
+    """
+    Returns the first limit objects of objs, fetched with one more to
+    tell whether there is a next page, and the cursor of that next page
+    or None
+    """
+    if limit is None or len(objs) <= limit:
+        return objs, None
+    objs = objs[:limit]
+    return objs, encode_cursor(order_by, objs[-1])
+
+
+def jsonify_page(objs, order_by, limit, fields=None):
+    """
+    Returns the JSON list of the dictionaries of the first limit objects
+    of objs, fetched with one more, with only the id and the attributes
+    of fields if given; the cursor of the next page, if any,
+    is set in the X-Next-Cursor header, and the URL of the request with
+    that cursor as after in the Link header
+    """
+    objs, cursor = split_page(list(objs), order_by, limit)
+    response = jsonify([obj.to_dict(fields=fields) for obj in objs])
+    if cursor is not None:
+        args = request.args.to_dict()
+        args['after'] = cursor
+        response.headers['X-Next-Cursor'] = cursor
+        response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+            request.base_url, urlencode(args))
+    return response
@@ -1,44 +1,89 @@
 #!/usr/bin/python3
 """ objects that handle all default RestFul API actions for Places """
-from models.state import State
+from models.amenity import Amenity
 from models.city import City
 from models.place import Place
+from models.state import State
 from models.user import User
-from models.amenity import Amenity
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.cache import cached, searches
+from api.v1.views.conditional import class_versions, conditional
+from api.v1.views.paging import field_args, jsonify_page, page_args, split_page
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
+import json
+
+# the attributes places_search can order places by
+order_fields = ("id", "name", "number_rooms", "number_bathrooms",
+                "max_guest", "price_by_night", "created_at", "updated_at")
+
+
+# the largest page of places_search whose ids are cached
+cached_page_max = 1000
+
+
+def search_args(data):
+    """
+    Returns the states, cities and amenities of a places_search body,
+    None for those missing or empty, aborting with 400 if one is not a
+    list of strings
+    """
+    args = []
+    for name in ('states', 'cities', 'amenities'):
+        ids = data.get(name, None)
+        if ids is not None and (not isinstance(ids, list) or not all(
+                isinstance(id, str) for id in ids)):
+            abort(400, description="Invalid " + name)
+        args.append(ids or None)
+    return args
+
+
+def search_key(*args):
+    """
+    Returns the cache key of a places_search: its lists of ids sorted
+    without repeats, then the rest of args
+    """
+    return json.dumps([sorted(set(arg)) if isinstance(arg, list) else arg
+                       for arg in args], default=str)
 
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
 @swag_from('documentation/place/get_places.yml', methods=['GET'])
+@conditional(City, Place)
+@cached(City, Place)
 def get_places(city_id):
     """
-    Retrieves the list of all Place objects of a City
+    Retrieves the list of all Place objects of a City, a page of them
+    when limit or after is given
     """
     city = storage.get(City, city_id)
 
     if not city:
         abort(404)
 
-    places = [place.to_dict() for place in city.places]
+    order_by, after, limit = page_args(request.args, cursor="after")
+    fields = field_args(request.args)
+    places = storage.related(Place, "city_id", city.id, order_by, after,
+                             limit and limit + 1, fields)
 
-    return jsonify(places)
+    return jsonify_page(places, order_by, limit, fields)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/place/get_place.yml', methods=['GET'])
+@conditional(Place)
 def get_place(place_id):
     """
     Retrieves a Place object
     """
-    place = storage.get(Place, place_id)
+    fields = field_args(request.args)
+    place = storage.get(Place, place_id, fields)
     if not place:
         abort(404)
 
-    return jsonify(place.to_dict())
+    return jsonify(place.to_dict(fields=fields))
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'],
@@ -119,62 +164,53 @@ def put_place(place_id):
 
 @app_views.route('/places_search', methods=['POST'], strict_slashes=False)
 @swag_from('documentation/place/post_search.yml', methods=['POST'])
+@cached(State, City, Place, Amenity)
 def places_search():
     """
     Retrieves all Place objects depending of the JSON in the body
-    of the request
+    of the request, a page of them when limit or cursor is given, with
+    only the attributes listed in fields if given; the ids found for a
+    page of the same states, cities and amenities are reused until a
+    State, a City, a Place or an Amenity changes
     """
 
     if request.get_json() is None:
         abort(400, description="Not a JSON")
 
-    data = request.get_json()
-
-    if data and len(data):
-        states = data.get('states', None)
-        cities = data.get('cities', None)
-        amenities = data.get('amenities', None)
-
-    if not data or not len(data) or (
-            not states and
-            not cities and
-            not amenities):
-        places = storage.all(Place).values()
-        list_places = []
-        for place in places:
-            list_places.append(place.to_dict())
-        return jsonify(list_places)
-
-    list_places = []
-    if states:
-        states_obj = [storage.get(State, s_id) for s_id in states]
-        for state in states_obj:
-            if state:
-                for city in state.cities:
-                    if city:
-                        for place in city.places:
-                            list_places.append(place)
-
-    if cities:
-        city_obj = [storage.get(City, c_id) for c_id in cities]
-        for city in city_obj:
-            if city:
-                for place in city.places:
-                    if place not in list_places:
-                        list_places.append(place)
-
-    if amenities:
-        if not list_places:
-            list_places = storage.all(Place).values()
-        amenities_obj = [storage.get(Amenity, a_id) for a_id in amenities]
-        list_places = [place for place in list_places
-                       if all([am in place.amenities
-                               for am in amenities_obj])]
+    data = request.get_json() or {}
+
+    states, cities, amenities = search_args(data)
+    order_by, after, limit = page_args(data, order_fields)
+    fields = field_args(data)
+
+    found = []
+
+    def search():
+        """searches storage, returns the ids of the places found"""
+        found.extend(storage.search(states, cities, amenities, order_by,
+                                    after, limit and limit + 1, fields))
+        return tuple(place.id for place in found)
+
+    if limit is None or limit > cached_page_max:
+        # listed in the order of the lists of the body when not paged
+        search()
+    else:
+        key = search_key(states, cities, amenities, order_by, after, limit)
+        versions = class_versions((State, City, Place, Amenity))
+        ids = searches.run(key, [tag for tag, _ in versions], search)
+        if ids and not found:
+            by_key = storage.eager(Place, ids=ids)
+            found = [by_key[k] for k in ("Place." + id for id in ids)
+                     if k in by_key]
+    found, cursor = split_page(found, order_by, limit)
 
     places = []
-    for p in list_places:
-        d = p.to_dict()
+    for p in found:
+        d = p.to_dict(fields=fields)
         d.pop('amenities', None)
         places.append(d)
 
-    return jsonify(places)
+    response = jsonify(places)
+    if cursor is not None:
+        response.headers['X-Next-Cursor'] = cursor
+    return response
@@ -2,9 +2,11 @@
 """ objects that handle all default RestFul API actions for Place - Amenity """
 from models.place import Place
 from models.amenity import Amenity
-from models import storage
+from models import storage, storage_t
 from api.v1.views import app_views
-from os import environ
+from api.v1.views.cache import cached
+from api.v1.views.conditional import conditional
+from api.v1.views.paging import field_args
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -13,6 +15,8 @@ from flasgger.utils import swag_from
                  strict_slashes=False)
 @swag_from('documentation/place_amenity/get_places_amenities.yml',
            methods=['GET'])
+@conditional(Place, Amenity)
+@cached(Place, Amenity)
 def get_place_amenities(place_id):
     """
     Retrieves the list of all Amenity objects of a Place
@@ -22,10 +26,12 @@ def get_place_amenities(place_id):
     if not place:
         abort(404)
 
-    if environ.get('HBNB_TYPE_STORAGE') == "db":
-        amenities = [amenity.to_dict() for amenity in place.amenities]
+    fields = field_args(request.args)
+    if storage_t == "db":
+        amenities = [amenity.to_dict(fields=fields)
+                     for amenity in place.amenities]
     else:
-        amenities = [storage.get(Amenity, amenity_id).to_dict()
+        amenities = [storage.get(Amenity, amenity_id).to_dict(fields=fields)
                      for amenity_id in place.amenity_ids]
 
     return jsonify(amenities)
@@ -49,14 +55,15 @@ def delete_place_amenity(place_id, amenity_id):
     if not amenity:
         abort(404)
 
-    if environ.get('HBNB_TYPE_STORAGE') == "db":
+    if storage_t == "db":
         if amenity not in place.amenities:
             abort(404)
         place.amenities.remove(amenity)
     else:
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
+        place.amenity_ids = [a_id for a_id in place.amenity_ids
+                             if a_id != amenity_id]
 
     storage.save()
     return make_response(jsonify({}), 200)
@@ -80,7 +87,7 @@ def post_place_amenity(place_id, amenity_id):
     if not amenity:
         abort(404)
 
-    if environ.get('HBNB_TYPE_STORAGE') == "db":
+    if storage_t == "db":
         if amenity in place.amenities:
             return make_response(jsonify(amenity.to_dict()), 200)
         else:
@@ -89,7 +96,7 @@ def post_place_amenity(place_id, amenity_id):
         if amenity_id in place.amenity_ids:
             return make_response(jsonify(amenity.to_dict()), 200)
         else:
-            place.amenity_ids.append(amenity_id)
+            place.amenity_ids = place.amenity_ids + [amenity_id]
 
     storage.save()
     return make_response(jsonify(amenity.to_dict()), 201)
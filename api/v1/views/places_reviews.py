@@ -5,6 +5,9 @@ from models.place import Place
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.cache import cached
+from api.v1.views.conditional import conditional
+from api.v1.views.paging import field_args, jsonify_page, page_args
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -12,31 +15,39 @@ from flasgger.utils import swag_from
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
 @swag_from('documentation/reviews/get_reviews.yml', methods=['GET'])
+@conditional(Place, Review)
+@cached(Place, Review)
 def get_reviews(place_id):
     """
-    Retrieves the list of all Review objects of a Place
+    Retrieves the list of all Review objects of a Place, a page of them
+    when limit or after is given
     """
     place = storage.get(Place, place_id)
 
     if not place:
         abort(404)
 
-    reviews = [review.to_dict() for review in place.reviews]
+    order_by, after, limit = page_args(request.args, cursor="after")
+    fields = field_args(request.args)
+    reviews = storage.related(Review, "place_id", place.id, order_by, after,
+                              limit and limit + 1, fields)
 
-    return jsonify(reviews)
+    return jsonify_page(reviews, order_by, limit, fields)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/reviews/get_review.yml', methods=['GET'])
+@conditional(Review)
 def get_review(review_id):
     """
     Retrieves a Review object
     """
-    review = storage.get(Review, review_id)
+    fields = field_args(request.args)
+    review = storage.get(Review, review_id, fields)
     if not review:
         abort(404)
 
-    return jsonify(review.to_dict())
+    return jsonify(review.to_dict(fields=fields))
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'],
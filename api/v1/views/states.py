@@ -3,32 +3,40 @@
 from models.state import State
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.cache import cached
+from api.v1.views.conditional import conditional
+from api.v1.views.paging import field_args, jsonify_page, page_args
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/state/get_state.yml', methods=['GET'])
+@conditional(State)
+@cached(State)
 def get_states():
     """
-    Retrieves the list of all State objects
+    Retrieves the list of all State objects, a page of them when limit
+    or after is given
     """
-    all_states = storage.all(State).values()
-    list_states = []
-    for state in all_states:
-        list_states.append(state.to_dict())
-    return jsonify(list_states)
+    order_by, after, limit = page_args(request.args, cursor="after")
+    fields = field_args(request.args)
+    all_states = storage.all(State, order_by, after,
+                             limit and limit + 1, fields).values()
+    return jsonify_page(all_states, order_by, limit, fields)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/state/get_id_state.yml', methods=['get'])
+@conditional(State)
 def get_state(state_id):
     """ Retrieves a specific State """
-    state = storage.get(State, state_id)
+    fields = field_args(request.args)
+    state = storage.get(State, state_id, fields)
     if not state:
         abort(404)
 
-    return jsonify(state.to_dict())
+    return jsonify(state.to_dict(fields=fields))
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'],
@@ -3,33 +3,40 @@
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.cache import cached
+from api.v1.views.conditional import conditional
+from api.v1.views.paging import field_args, jsonify_page, page_args
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/user/all_users.yml')
+@conditional(User)
+@cached(User)
 def get_users():
     """
     Retrieves the list of all user objects
-    or a specific user
+    or a specific user, a page of them when limit or after is given
     """
-    all_users = storage.all(User).values()
-    list_users = []
-    for user in all_users:
-        list_users.append(user.to_dict())
-    return jsonify(list_users)
+    order_by, after, limit = page_args(request.args, cursor="after")
+    fields = field_args(request.args)
+    all_users = storage.all(User, order_by, after,
+                            limit and limit + 1, fields).values()
+    return jsonify_page(all_users, order_by, limit, fields)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/user/get_user.yml', methods=['GET'])
+@conditional(User)
 def get_user(user_id):
     """ Retrieves an user """
-    user = storage.get(User, user_id)
+    fields = field_args(request.args)
+    user = storage.get(User, user_id, fields)
     if not user:
         abort(404)
 
-    return jsonify(user.to_dict())
+    return jsonify(user.to_dict(fields=fields))
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'],
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Builds N places holding 3 of 30 amenities each in FileStorage, then times
+storage.search() with three amenities through the amenity index against
+a scan of every place's amenity_ids
+
+usage: ./benchmarks/amenity_search.py [N]   (default: 200000)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models.engine.file_storage import FileStorage, search_places
+from models.place import Place
+
+
+def timed(function, *args, **kwargs):
+    """returns the result of function and the seconds it took, best of 5"""
+    best = None
+    for i in range(5):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    amenities = ["amenity-{}".format(i) for i in range(30)]
+    storage = FileStorage()
+    start = time.perf_counter()
+    for i in range(count):
+        storage.new(Place(name=str(i), city_id="city",
+                          amenity_ids=random.sample(amenities, 3)))
+    print("{} places built in {:.1f} s".format(
+        count, time.perf_counter() - start))
+    for wanted in [amenities[:1], amenities[:2], amenities[:3]]:
+        found, index = timed(storage.search, amenities=wanted)
+        scanned, scan = timed(search_places, storage, amenities=wanted)
+        assert sorted(p.id for p in found) == sorted(p.id for p in scanned)
+        print("{} amenities, {:>6} places: index {:>9.3f} ms, "
+              "scan {:>9.3f} ms".format(len(wanted), len(found),
+                                        index * 1000, scan * 1000))
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""
+Saves S states of 10 cities of 10 places each and 100 amenities, the
+last of them linked to the first place of each city, then times GET
+/states, /amenities, /states/<id>/cities and a page of 50 places of a
+places_search of 10 states with that amenity through the API with the
+caches turned off and on (and for the search, with only the cache of
+the ids found), and once more right after renaming an object of the
+class each answers with (so every cached response is computed again).
+Last, 16 threads send the same search at once right after a place
+changes, with coalescing off and on
+
+Without HBNB_TYPE_STORAGE the objects are kept in file storage.
+
+usage: ./benchmarks/api_cache.py [S]   (default: 100)
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from api.v1.app import app
+from api.v1.views import cache, places
+
+
+class Uncached:
+    """runs every search, as places_search did before"""
+
+    def run(self, key, tags, compute):
+        """returns compute()"""
+        return compute()
+
+
+def seed(count):
+    """saves the objects, returns the requests to time"""
+    user = User(email="cache@hbnb.io", password="pwd")
+    models.storage.new(user)
+    for i in range(100):
+        amenity = Amenity(name="Amenity {}".format(i))
+        models.storage.new(amenity)
+    states = []
+    for i in range(count):
+        state = State(name="State {}".format(i))
+        models.storage.new(state)
+        states.append(state.id)
+        for j in range(10):
+            city = City(name="City {}".format(j), state_id=state.id)
+            models.storage.new(city)
+            for k in range(10):
+                place = Place(name="Place {}".format(k), city_id=city.id,
+                              user_id=user.id)
+                if k == 0 and models.storage_t == "db":
+                    place.amenities.append(amenity)
+                elif k == 0:
+                    place.amenity_ids = [amenity.id]
+                models.storage.new(place)
+    models.storage.save()
+    models.storage.close()
+    return [("GET", "/api/v1/states", None, State),
+            ("GET", "/api/v1/amenities", None, Amenity),
+            ("GET", "/api/v1/states/{}/cities".format(states[0]), None,
+             City),
+            ("POST", "/api/v1/places_search",
+             {"states": states[:10], "amenities": [amenity.id], "limit": 50},
+             Place)]
+
+
+def percentiles(client, method, path, body, write=None, runs=50):
+    """
+    returns the p50 and p99 in seconds of a request, each made after
+    renaming an object of write if given
+    """
+    times = []
+    for i in range(runs):
+        if write is not None:
+            obj, = models.storage.all(write, limit=1).values()
+            obj.name = "write {}".format(i)
+            obj.save()
+        start = time.perf_counter()
+        response = client.open(path, method=method, json=body)
+        times.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    times.sort()
+    return times[len(times) // 2], times[min(runs - 1, runs * 99 // 100)]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    requests = seed(count)
+    client = app.test_client()
+    shared = cache.responses or cache.MemoryCache(64 * 2 ** 20)
+    searches = places.searches
+    for method, path, body, cls in requests:
+        print("{} {}".format(method, path[len("/api/v1"):]))
+        for label, responses, ids, write in [
+                ("off", None, Uncached(), None),
+                ("ids only", None, searches, None),
+                ("on", shared, searches, None),
+                ("on + writes", shared, searches, cls)]:
+            if label == "ids only" and method == "GET":
+                continue
+            cache.responses, places.searches = responses, ids
+            client.open(path, method=method, json=body)
+            p50, p99 = percentiles(client, method, path, body, write)
+            print("  cache {:<12} p50 {:>8.3f} ms, p99 {:>8.3f} ms"
+                  .format(label, p50 * 1000, p99 * 1000))
+
+    method, path, body, cls = requests[-1]
+    searched = []
+    search = type(models.storage).search
+
+    def counted(*args, **kwargs):
+        """counts the searches reaching storage"""
+        searched.append(args)
+        return search(*args, **kwargs)
+    type(models.storage).search = counted
+    cache.responses = None
+    for label, ids in [("off", Uncached()), ("on", searches)]:
+        places.searches = ids
+        searched.clear()
+        obj, = models.storage.all(Place, limit=1).values()
+        obj.name = "write {}".format(label)
+        obj.save()
+        models.storage.close()
+        threads = [threading.Thread(target=app.test_client().open,
+                                    args=(path,),
+                                    kwargs={"method": method, "json": body})
+                   for i in range(16)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print("16 concurrent searches, coalescing {:<3} {:>2} computed, "
+              "{:>8.3f} ms".format(label, len(searched),
+                                   (time.perf_counter() - start) * 1000))
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Runs the API in a threaded server against a local database and reports
+its throughput and latency under 1, 4 and 16 concurrent clients (or the
+given counts), followed by the connection pool counters of DBStorage
+
+Without HBNB_TYPE_STORAGE the database is a fresh SQLite file; set the
+HBNB_TYPE_STORAGE=db and HBNB_MYSQL_* variables (and HBNB_MYSQL_POOL_*)
+to load a MySQL database instead.
+
+usage: ./benchmarks/api_load.py [SECONDS] [CLIENTS...]   (default: 5)
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+if not os.environ.get("HBNB_TYPE_STORAGE"):
+    os.environ["HBNB_TYPE_STORAGE"] = "sqlite"
+    os.environ["HBNB_SQLITE_DB"] = os.path.abspath("load.db")
+
+from werkzeug.serving import make_server
+import models
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from api.v1.app import app
+
+
+def seed():
+    """saves states, cities and places, returns the paths to request"""
+    user = User(email="load@hbnb.io", password="pwd")
+    user.save()
+    paths = ["/api/v1/stats"]
+    for i in range(20):
+        state = State(name="State {}".format(i))
+        state.save()
+        paths.append("/api/v1/states/{}".format(state.id))
+        for j in range(5):
+            city = City(name="City {}".format(j), state_id=state.id)
+            city.save()
+            paths.append("/api/v1/cities/{}/places".format(city.id))
+            for k in range(2):
+                place = Place(name="Place {}".format(k), city_id=city.id,
+                              user_id=user.id)
+                place.save()
+                paths.append("/api/v1/places/{}".format(place.id))
+    models.storage.close()
+    return paths
+
+
+def client(base, paths, deadline, latencies, errors):
+    """requests random paths until deadline"""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            with urlopen(base + random.choice(paths)) as response:
+                response.read()
+        except OSError:
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    counts = [int(arg) for arg in sys.argv[2:]] or [1, 4, 16]
+    paths = seed()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = "http://127.0.0.1:{}".format(server.server_port)
+    print("storage: {}".format(type(models.storage).__name__))
+    print("{:>8} {:>10} {:>10} {:>10} {:>8}".format(
+        "clients", "req/s", "p50 (ms)", "p99 (ms)", "errors"))
+    for count in counts:
+        latencies, errors = [], []
+        deadline = time.perf_counter() + seconds
+        threads = [threading.Thread(target=client,
+                                    args=(base, paths, deadline,
+                                          latencies, errors))
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] if latencies else 0
+        p99 = latencies[len(latencies) * 99 // 100] if latencies else 0
+        print("{:>8} {:>10.1f} {:>10.2f} {:>10.2f} {:>8}".format(
+            count, len(latencies) / seconds, p50 * 1000, p99 * 1000,
+            len(errors)))
+    server.shutdown()
+    if hasattr(models.storage, "pool_stats"):
+        print("pool: {}".format(models.storage.pool_stats()))
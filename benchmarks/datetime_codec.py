@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Checks that parse_time / format_time give the same results as strptime /
+strftime with the BaseModel time format, then times both per call and per
+object on the reload (dict -> model) and serialization (to_dict) paths
+
+usage: ./benchmarks/datetime_codec.py [N]   (default: 100000)
+"""
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models import base_model
+from models.base_model import format_time, parse_time, time
+from models.place import Place
+
+
+def check(count):
+    """compares both codecs on count random datetimes"""
+    start = datetime(1970, 1, 1)
+    for i in range(count):
+        value = start + timedelta(seconds=random.randint(0, 2 ** 32),
+                                  microseconds=random.randint(0, 999999))
+        if i % 10 == 0:
+            value = value.replace(microsecond=0)
+        text = value.strftime(time)
+        assert format_time(value) == text, value
+        assert parse_time(text) == datetime.strptime(text, time), text
+
+
+def per_object(count):
+    """times building and serializing count places with each codec"""
+    record = Place(name="Casa", city_id="c", user_id="u").to_dict()
+    places = [Place(**record) for i in range(1000)]
+    results = {}
+    for name, parse, fmt in [
+            ("strptime/strftime", lambda v: datetime.strptime(v, time),
+             lambda v: v.strftime(time)),
+            ("parse_time/format_time", parse_time, format_time)]:
+        base_model.parse_time, base_model.format_time = parse, fmt
+        load = timeit.timeit(lambda: Place(**record), number=count)
+        dump = timeit.timeit(lambda: [p.to_dict() for p in places],
+                             number=count // 1000)
+        results[name] = (load / count * 1e6, dump / count * 1e6)
+    base_model.parse_time, base_model.format_time = parse_time, format_time
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    check(count)
+    print("{} datetimes: identical strings and values".format(count))
+    text = datetime.utcnow().strftime(time)
+    value = datetime.utcnow()
+    print("{:<24} {:>10} {:>10}".format("per call (us)", "parse", "format"))
+    for name, parse, fmt in [
+            ("strptime/strftime",
+             "datetime.strptime(text, time)", "value.strftime(time)"),
+            ("parse_time/format_time",
+             "parse_time(text)", "format_time(value)")]:
+        env = dict(globals(), text=text, value=value)
+        print("{:<24} {:>10.3f} {:>10.3f}".format(
+            name,
+            timeit.timeit(parse, globals=env, number=count) / count * 1e6,
+            timeit.timeit(fmt, globals=env, number=count) / count * 1e6))
+    print("{:<24} {:>10} {:>10}".format("per object (us)", "reload",
+                                        "to_dict"))
+    for name, (load, dump) in per_object(count).items():
+        print("{:<24} {:>10.3f} {:>10.3f}".format(name, load, dump))
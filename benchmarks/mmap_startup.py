@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Saves N places with file storage, then starts a fresh process per storage
+type that imports models and reads one place, and reports the time that
+took and the peak memory of the process
+
+usage: ./benchmarks/mmap_startup.py [N]   (default: 50000)
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+os.chdir(tempfile.mkdtemp())
+
+child = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import models
+from models.place import Place
+place = models.storage.get(Place, {id!r})
+assert place.name == "Place 0"
+elapsed = time.perf_counter() - start
+with open("/proc/self/status") as f:
+    print(elapsed, f.read().split("VmRSS:")[1].split()[0])
+"""
+
+
+def fill(count):
+    """saves count places to file.json, returns the id of the first one"""
+    from models.engine.file_storage import FileStorage
+    from models.place import Place
+    storage = FileStorage()
+    places = [Place(name="Place {}".format(i), city_id="c", user_id="u",
+                    number_rooms=i % 5) for i in range(count)]
+    for place in places:
+        storage.new(place)
+    storage.save()
+    return places[0].id
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    code = child.format(root=root, id=fill(count))
+    print("{} places".format(count))
+    print("{:<20} {:>12} {:>14}".format("storage", "startup (s)",
+                                        "RSS (KiB)"))
+    for name, env in [("file", {}),
+                      ("mmap (import)", {"HBNB_TYPE_STORAGE": "mmap"}),
+                      ("mmap", {"HBNB_TYPE_STORAGE": "mmap"})]:
+        out = subprocess.run([sys.executable, "-c", code], check=True,
+                             env=dict(os.environ, **env),
+                             stdout=subprocess.PIPE).stdout.decode().split()
+        print("{:<20} {:>12.3f} {:>14}".format(name, float(out[0]), out[1]))
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Compares the memory held per object by the regular models and by the
+compact ones (HBNB_COMPACT_MODELS=1) once reloaded from file.json and
+written back by save()
+
+usage: ./benchmarks/model_memory.py [N]   (default: 100000)
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(count):
+    """prints the bytes per object allocated to reload and save count"""
+    import tracemalloc
+    import uuid
+    sys.path.insert(0, root)
+    os.chdir(tempfile.mkdtemp())
+    import models
+    from models.engine.file_storage import FileStorage
+    from models.place import Place
+    from models.review import Review
+
+    users = [str(uuid.uuid4()) for i in range(1000)]
+    places = []
+    for i in range(count // 5):
+        place = Place(name="Place {}".format(i), city_id=users[i % 100],
+                      user_id=users[i % 1000], number_rooms=i % 5,
+                      latitude=1.5, longitude=-2.5)
+        models.storage.new(place)
+        places.append(place.id)
+    for i in range(count - len(places)):
+        models.storage.new(Review(text="Nice", place_id=places[i % 997],
+                                  user_id=users[i % 1000]))
+    models.storage.save()
+    FileStorage._FileStorage__objects.clear()
+    FileStorage._FileStorage__by_class.clear()
+    FileStorage._FileStorage__by_parent.clear()
+    FileStorage._FileStorage__serialized.clear()
+    FileStorage._FileStorage__file_stat = None
+    tracemalloc.start()
+    models.storage.reload()
+    loaded = tracemalloc.get_traced_memory()[0]
+    for obj in models.storage.all().values():
+        obj.to_dict()
+    used = tracemalloc.get_traced_memory()[0]
+    print(loaded / count, used / count)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        measure(int(sys.argv[2]))
+        sys.exit()
+    count = sys.argv[1] if len(sys.argv) > 1 else "100000"
+    print("{:<10} {:>16} {:>16}".format("models", "bytes/object",
+                                        "after to_dict"))
+    for name, value in [("regular", "0"), ("compact", "1")]:
+        env = dict(os.environ, HBNB_COMPACT_MODELS=value)
+        out = subprocess.check_output([sys.executable, __file__, "-",
+                                       count], env=env)
+        loaded, used = out.split()[-2:]
+        print("{:<10} {:>16.0f} {:>16.0f}".format(name, float(loaded),
+                                                  float(used)))
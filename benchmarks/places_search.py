@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Builds S states of 20 cities of P places each in FileStorage, then times
+a places_search over every state plus one city of each (so every place of
+those cities is reached twice), deduplicating with list membership as the
+view used to against storage.search() and its ordered sets keyed by id
+
+usage: ./benchmarks/places_search.py [S] [P]   (default: 50 100)
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+
+
+def list_search(storage, states, cities):
+    """returns the places of states then cities, deduplicated in a list"""
+    list_places = []
+    for state_id in states:
+        for city in storage.related(City, "state_id", state_id):
+            for place in storage.related(Place, "city_id", city.id):
+                list_places.append(place)
+    for city_id in cities:
+        for place in storage.related(Place, "city_id", city_id):
+            if place not in list_places:
+                list_places.append(place)
+    return list_places
+
+
+def percentiles(function, *args, runs=20):
+    """returns the result of function and its p50 and p99 in seconds"""
+    times = []
+    for i in range(runs):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return (result, times[len(times) // 2],
+            times[min(len(times) - 1, len(times) * 99 // 100)])
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    per_city = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    storage = FileStorage()
+    states, cities = [], []
+    for i in range(count):
+        state = State(name=str(i))
+        storage.new(state)
+        states.append(state.id)
+        for j in range(20):
+            city = City(name=str(j), state_id=state.id)
+            storage.new(city)
+            if j == 0:
+                cities.append(city.id)
+            for k in range(per_city):
+                storage.new(Place(name=str(k), city_id=city.id))
+    for runs, function, args in [
+            (3, list_search, (storage, states, cities)),
+            (20, storage.search, (states, cities))]:
+        found, p50, p99 = percentiles(function, *args, runs=runs)
+        print("{:<12} {:>7} places: p50 {:>10.3f} ms, p99 {:>10.3f} ms"
+              .format(function.__name__, len(found), p50 * 1000, p99 * 1000))
+        if function is list_search:
+            expected = [p.id for p in found]
+        else:
+            assert [p.id for p in found] == expected
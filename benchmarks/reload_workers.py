@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Measures how long FileStorage.reload() takes to build N objects from
+file.json with 1, 2, 4 and 8 worker processes, each reload in a fresh
+process so none starts with the objects or indexes of another
+
+usage: ./benchmarks/reload_workers.py [N ...]   (default: 100000 1000000)
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fill(count):
+    """writes a file.json holding count places and reviews"""
+    sys.path.insert(0, root)
+    import models
+    from models.place import Place
+    from models.review import Review
+
+    for i in range(count // 2):
+        place = Place(name="Place {}".format(i), city_id="c", user_id="u",
+                      number_rooms=i % 5, latitude=1.5, longitude=-2.5)
+        models.storage.new(place)
+        models.storage.new(Review(text="Nice", place_id=place.id,
+                                  user_id="u"))
+    models.storage.save()
+
+
+def reload(workers):
+    """
+    prints the seconds one cold reload of the file.json of the current
+    directory takes with workers processes, then the objects it built
+    """
+    path = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    sys.path.insert(0, root)
+    import models
+    from models.engine.file_storage import FileStorage
+
+    os.chdir(path)
+    FileStorage._FileStorage__reload_workers = workers
+    start = time.perf_counter()
+    models.storage.reload()
+    print(time.perf_counter() - start, models.storage.count())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3 and sys.argv[1] == "-":
+        {"fill": fill, "reload": reload}[sys.argv[2]](int(sys.argv[3]))
+        sys.exit()
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    print("{:>9} {:>8} {:>9} {:>8}".format("objects", "workers",
+                                           "seconds", "speedup"))
+    for count in sizes:
+        path = tempfile.mkdtemp()
+        subprocess.run([sys.executable, __file__, "-", "fill", str(count)],
+                       cwd=path, check=True)
+        base = None
+        for workers in [1, 2, 4, 8]:
+            out = subprocess.check_output([sys.executable, __file__, "-",
+                                           "reload", str(workers)], cwd=path)
+            elapsed, found = out.split()[-2:]
+            elapsed = float(elapsed)
+            assert int(found) == count
+            base = base or elapsed
+            print("{:>9} {:>8} {:>9.3f} {:>7.2f}x".format(
+                count, workers, elapsed, base / elapsed))
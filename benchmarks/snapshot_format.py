@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+Saves N places, users and reviews with the JSON and the columnar snapshot
+formats, then reports the size of each file and the time reload() takes
+to rebuild the objects from it
+
+usage: ./benchmarks/snapshot_format.py [N]   (default: 20000)
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp())
+
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+def fill(storage, count):
+    """adds count users, each with a place and a review"""
+    for i in range(count):
+        user = User(email="user{}@hbnb.io".format(i), password="pwd",
+                    first_name="User", last_name=str(i))
+        place = Place(name="Place {}".format(i), user_id=user.id,
+                      city_id="city", number_rooms=i % 7, latitude=i / 3,
+                      amenity_ids=["wifi", "tv"])
+        review = Review(place_id=place.id, user_id=user.id,
+                        text="Stayed at place {}".format(i))
+        for obj in (user, place, review):
+            storage.new(obj)
+
+
+def measure(storage, fmt, path):
+    """writes the snapshot with fmt, returns its size and reload time"""
+    FileStorage._FileStorage__format = fmt
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__journal_path = path + ".log"
+    storage.compact()
+    expected = {k: v.to_dict() for k, v in storage.all().items()}
+    FileStorage._FileStorage__file_stat = None
+    start = time.perf_counter()
+    storage.reload()
+    elapsed = time.perf_counter() - start
+    got = {k: v.to_dict() for k, v in storage.all().items()}
+    assert got == expected
+    return os.path.getsize(path), elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    storage = FileStorage()
+    fill(storage, count)
+    print("{} objects".format(len(storage.all())))
+    print("{:<10} {:>12} {:>12}".format("format", "bytes", "reload (s)"))
+    for fmt, path in [("json", "file.json"), ("columnar", "file.col")]:
+        size, elapsed = measure(storage, fmt, path)
+        print("{:<10} {:>12} {:>12.3f}".format(fmt, size, elapsed))
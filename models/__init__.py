@@ -8,9 +8,17 @@ from os import getenv
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
 
-if storage_t == "db":
+if storage_t == "sqlite":
+    # the same SQLAlchemy models as MySQL, on a local SQLite file
+    storage_t = "db"
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
+elif storage_t == "mmap":
+    from models.engine.mmap_storage import MmapStorage
+    storage = MmapStorage()
 else:
     from models.engine.file_storage import FileStorage
     storage = FileStorage()
@@ -6,15 +6,74 @@ Contains class BaseModel
 from datetime import datetime
 import models
 from os import getenv
+import sys
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# keep the attributes of file storage models in __slots__, not in __dict__
+# (not with mmap storage, which tracks decoded objects through weakrefs)
+compact = (models.storage_t not in ("db", "mmap") and
+           getenv("HBNB_COMPACT_MODELS") == "1")
+
+
+def parse_time(value):
+    """returns the datetime written in value with the format time"""
+    if len(value) == 26 and value[10] == "T" and value[19] == ".":
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """returns the datetime value as a string with the format time"""
+    if value.tzinfo is None and value.year >= 1000:
+        return value.isoformat(timespec="microseconds")
+    return value.strftime(time)
+
+
+def attributes(obj):
+    """returns a new dictionary of the attributes set on a compact obj"""
+    new_dict = {}
+    for cls in reversed(type(obj).__mro__):
+        for name in cls.__dict__.get("__slots__", ()):
+            if name != "_extra":
+                try:
+                    new_dict[name] = cls.__dict__[name].__get__(obj)
+                except AttributeError:
+                    pass
+    new_dict.update(getattr(obj, "_extra", None) or {})
+    return new_dict
+
+
+class Compact(type):
+    """
+    Metaclass turning the attribute defaults of a model class into
+    __slots__, the default values being kept in _defaults
+    """
+    def __new__(mcs, name, bases, namespace):
+        """creates the class with one slot per default"""
+        defaults = {}
+        for key, value in list(namespace.items()):
+            if not (key.startswith("__") or callable(value) or
+                    isinstance(value, (property, classmethod,
+                                       staticmethod))):
+                defaults[key] = namespace.pop(key)
+        namespace["__slots__"] = tuple(defaults)
+        cls = super().__new__(mcs, name, bases, namespace)
+        cls._defaults = {}
+        for base in reversed(cls.__mro__[1:]):
+            cls._defaults.update(base.__dict__.get("_defaults", {}))
+        cls._defaults.update(defaults)
+        return cls
 
 if models.storage_t == "db":
     Base = declarative_base()
+elif compact:
+    class Base(metaclass=Compact):
+        """Root of the compact model classes"""
+        __slots__ = ()
 else:
     Base = object
 
@@ -25,6 +84,8 @@ class BaseModel:
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    elif compact:
+        __slots__ = ("id", "created_at", "updated_at", "_extra")
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
@@ -33,12 +94,12 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
+                self.created_at = parse_time(kwargs["created_at"])
+            elif type(kwargs.get("created_at", None)) is not datetime:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
+                self.updated_at = parse_time(kwargs["updated_at"])
+            elif type(kwargs.get("updated_at", None)) is not datetime:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
                 self.id = str(uuid.uuid4())
@@ -47,10 +108,51 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """
+            sets an attribute, letting the storage update its indexes
+            before and the version of the class after
+            """
+            if compact and type(value) is str and name[-2:] == "id":
+                value = sys.intern(value)
+            models.storage.touch(self, name, value)
+            if compact and not hasattr(getattr(type(self), name, None),
+                                       "__set__"):
+                if getattr(self, "_extra", None) is None:
+                    object.__setattr__(self, "_extra", {})
+                self._extra[name] = value
+            else:
+                super().__setattr__(name, value)
+            models.storage.touched(self)
+
+    if compact:
+        def __getattr__(self, name):
+            """returns an attribute set outside the slots, or its default"""
+            if name != "_extra":
+                extra = getattr(self, "_extra", None)
+                if extra is not None and name in extra:
+                    return extra[name]
+                defaults = getattr(type(self), "_defaults", {})
+                if name in defaults:
+                    return defaults[name]
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                type(self).__name__, name))
+
+        def __getstate__(self):
+            """returns the attributes to pickle, leaving defaults out"""
+            return attributes(self)
+
+        def __setstate__(self, state):
+            """sets the attributes of an unpickled object"""
+            for key, value in state.items():
+                setattr(self, key, value)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
-                                         self.__dict__)
+                                         attributes(self) if compact
+                                         else self.__dict__)
 
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
@@ -58,14 +160,23 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self, save_fs=None):
-        """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
+    def to_dict(self, save_fs=None, fields=None):
+        """
+        returns a dictionary containing all keys/values of the instance,
+        or only the id and those named in fields
+        """
+        if fields is None:
+            new_dict = attributes(self) if compact else self.__dict__.copy()
+        else:
+            values = attributes(self) if compact else self.__dict__
+            new_dict = {name: values[name] for name in ["id", *fields]
+                        if name in values}
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
-        new_dict["__class__"] = self.__class__.__name__
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
+        if fields is None or "__class__" in fields:
+            new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
         if save_fs is None:
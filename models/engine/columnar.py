@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+"""
+Columnar binary snapshot format for FileStorage
+
+The file starts with MAGIC and a section count, followed by one section
+per class: the class name, the number of rows and the number of columns,
+then each column as its name, a type code, a bitmap of the rows holding a
+value and the values of those rows:
+    i - 64-bit integers
+    f - 64-bit floats
+    t - created_at and updated_at, as 64-bit microseconds since the epoch
+    s - strings, as the 32-bit byte lengths followed by the UTF-8 bytes
+    j - anything else, as strings of JSON text
+Names are prefixed with their 32-bit length, all numbers are little-endian.
+
+usage: ./models/engine/columnar.py SOURCE DESTINATION
+converts a JSON snapshot to the columnar format, or back
+"""
+
+from array import array
+from datetime import datetime, timedelta
+import json
+import struct
+import sys
+
+MAGIC = b"HBNBCOL1"
+epoch = datetime(1970, 1, 1)
+microsecond = timedelta(microseconds=1)
+big_endian = sys.byteorder == "big"
+
+
+def column_type(name, values):
+    """returns the type code able to hold every value of column name"""
+    kinds = set(map(type, values))
+    if kinds == {int} and all(-2 ** 63 <= v < 2 ** 63 for v in values):
+        return "i"
+    if kinds == {float}:
+        return "f"
+    if kinds == {str} and name in ("created_at", "updated_at"):
+        for value in values:
+            if len(value) != 26 or value[10] != "T" or value[19] != ".":
+                return "j"
+            try:
+                stamp = datetime.fromisoformat(value)
+            except ValueError:
+                return "j"
+            if stamp.isoformat(timespec="microseconds") != value:
+                return "j"
+        return "t"
+    if kinds == {str}:
+        return "s"
+    return "j"
+
+
+def write_array(f, typecode, values):
+    """writes values as a little-endian array of typecode"""
+    data = array(typecode, values)
+    if big_endian:
+        data.byteswap()
+    f.write(data.tobytes())
+
+
+def read_array(f, typecode, count):
+    """reads a little-endian array of count values of typecode"""
+    data = array(typecode)
+    data.frombytes(f.read(data.itemsize * count))
+    if big_endian:
+        data.byteswap()
+    return data
+
+
+def write_string(f, value):
+    """writes value as a length-prefixed UTF-8 string"""
+    data = value.encode()
+    f.write(struct.pack("<I", len(data)))
+    f.write(data)
+
+
+def read_string(f):
+    """reads a length-prefixed UTF-8 string"""
+    size, = struct.unpack("<I", f.read(4))
+    return f.read(size).decode()
+
+
+def write_column(f, name, rows):
+    """writes the column name of the dictionaries in rows"""
+    present = bytearray((len(rows) + 7) // 8)
+    values = []
+    for i, row in enumerate(rows):
+        if name in row:
+            present[i // 8] |= 1 << (i % 8)
+            values.append(row[name])
+    kind = column_type(name, values)
+    write_string(f, name)
+    f.write(kind.encode())
+    f.write(bytes(present))
+    if kind == "i":
+        write_array(f, "q", values)
+    elif kind == "f":
+        write_array(f, "d", values)
+    elif kind == "t":
+        write_array(f, "q", [(datetime.fromisoformat(value) - epoch) //
+                             microsecond for value in values])
+    else:
+        if kind == "j":
+            values = [json.dumps(value) for value in values]
+        data = [value.encode() for value in values]
+        write_array(f, "I", [len(value) for value in data])
+        f.write(b"".join(data))
+
+
+def read_column(f, rows):
+    """reads a column, returns its name and its values by row number"""
+    name = read_string(f)
+    kind = f.read(1).decode()
+    present = f.read((rows + 7) // 8)
+    numbers = [i for i in range(rows) if present[i // 8] & (1 << (i % 8))]
+    count = len(numbers)
+    if kind == "i":
+        values = read_array(f, "q", count)
+    elif kind == "f":
+        values = read_array(f, "d", count)
+    elif kind == "t":
+        values = [epoch + value * microsecond
+                  for value in read_array(f, "q", count)]
+    else:
+        sizes = read_array(f, "I", count)
+        data = f.read(sum(sizes))
+        values, pos = [], 0
+        for size in sizes:
+            values.append(data[pos:pos + size].decode())
+            pos += size
+        if kind == "j":
+            values = [json.loads(value) for value in values]
+    return name, dict(zip(numbers, values))
+
+
+def dump(records, f):
+    """
+    writes the (key, dictionary) pairs of records to the binary file f,
+    each dictionary holding its class name under __class__
+    """
+    sections = {}
+    for key, value in records:
+        sections.setdefault(value["__class__"], []).append(value)
+    f.write(MAGIC)
+    f.write(struct.pack("<I", len(sections)))
+    for name, rows in sections.items():
+        columns = {}
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+        del columns["__class__"]
+        write_string(f, name)
+        f.write(struct.pack("<II", len(rows), len(columns)))
+        for column in columns:
+            write_column(f, column, rows)
+
+
+def load(f):
+    """
+    yields the (key, dictionary) pairs written in the binary file f, one
+    class section at a time; timestamps are returned as datetimes
+    """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a columnar snapshot")
+    sections, = struct.unpack("<I", f.read(4))
+    for i in range(sections):
+        name = read_string(f)
+        rows, count = struct.unpack("<II", f.read(8))
+        columns = [read_column(f, rows) for j in range(count)]
+        for row in range(rows):
+            value = {}
+            for column, values in columns:
+                if row in values:
+                    value[column] = values[row]
+            value["__class__"] = name
+            yield "{}.{}".format(name, value["id"]), value
+
+
+def to_json(value):
+    """returns value with its datetimes written as in the JSON file"""
+    return {k: v.isoformat(timespec="microseconds")
+            if type(v) is datetime else v for k, v in value.items()}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: {} SOURCE DESTINATION".format(sys.argv[0]))
+        sys.exit(1)
+    with open(sys.argv[1], 'rb') as src:
+        columnar = src.read(len(MAGIC)) == MAGIC
+        src.seek(0)
+        if columnar:
+            jo = {key: to_json(value) for key, value in load(src)}
+            with open(sys.argv[2], 'w') as dst:
+                json.dump(jo, dst)
+        else:
+            jo = json.loads(src.read().decode())
+            with open(sys.argv[2], 'wb') as dst:
+                dump(jo.items(), dst)
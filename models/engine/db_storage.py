@@ -11,46 +11,163 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from datetime import datetime
 from os import getenv
+import threading
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import (Column, DateTime, Integer, MetaData, String, Table,
+                        and_, create_engine, event, func, or_, select)
+from sqlalchemy.orm import (configure_mappers, joinedload, load_only,
+                            scoped_session, selectinload, sessionmaker)
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# version of the objects of each class, added to in the transaction of
+# every flush adding, changing or deleting some of them
+versions = Table("class_versions", MetaData(),
+                 Column("name", String(60), primary_key=True),
+                 Column("version", Integer, nullable=False),
+                 Column("updated_at", DateTime, nullable=False))
+# classes whose objects can be deleted along with those of a class
+dependents = {"Amenity": ("Place",), "City": ("Place",), "Place": ("Review",),
+              "State": ("City",), "User": ("Place", "Review")}
+
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # pool events counted by pool_stats()
+    __pool_events = {"connect": "connects", "checkout": "checkouts",
+                     "checkin": "checkins", "invalidate": "invalidations"}
 
     def __init__(self):
         """Instantiate a DBStorage object"""
+        HBNB_ENV = getenv('HBNB_ENV')
+        self.__engine = self.make_engine()
+        self.__pool_lock = threading.Lock()
+        self.__pool_counts = dict.fromkeys(self.__pool_events.values(), 0)
+        self.__pool_counts["peak_checkedout"] = 0
+        for name, counter in self.__pool_events.items():
+            event.listen(self.__engine, name, self.__pool_listener(counter))
+        if HBNB_ENV == "test":
+            Base.metadata.drop_all(self.__engine)
+            versions.metadata.drop_all(self.__engine)
+
+    def make_engine(self):
+        """returns the engine of the MySQL database set in the environment"""
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
-        HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
-        if HBNB_ENV == "test":
-            Base.metadata.drop_all(self.__engine)
+        return create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                             format(HBNB_MYSQL_USER,
+                                    HBNB_MYSQL_PWD,
+                                    HBNB_MYSQL_HOST,
+                                    HBNB_MYSQL_DB),
+                             **self.pool_options())
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def pool_options(self):
+        """returns the connection pool settings set in the environment"""
+        return {
+            'pool_size': int(getenv('HBNB_MYSQL_POOL_SIZE', 5)),
+            'max_overflow': int(getenv('HBNB_MYSQL_POOL_MAX_OVERFLOW', 10)),
+            'pool_timeout': float(getenv('HBNB_MYSQL_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(getenv('HBNB_MYSQL_POOL_RECYCLE', 3600)),
+            'pool_pre_ping': getenv('HBNB_MYSQL_POOL_PRE_PING', '1') == '1'}
+
+    def pool_stats(self):
+        """
+        returns the number of connections opened, checked out, checked in
+        and invalidated so far, the most ever checked out at once, and the
+        current size, idle, checked out and overflow counts of the pool
+        """
+        with self.__pool_lock:
+            stats = dict(self.__pool_counts)
+        pool = self.__engine.pool
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                stats[name] = getattr(pool, name)()
+        return stats
+
+    def all(self, cls=None, order_by=None, after=None, limit=None,
+            fields=None):
+        """
+        query on the current database session; order_by, after and limit
+        select a page of the objects of cls with ORDER BY and LIMIT, and
+        fields the only columns selected besides the id
+        """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss]).options(
+                    *self.__only(classes[clss], fields, order_by))
+                objs = self.__page(query, classes[clss], order_by, after,
+                                   limit).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def eager(self, cls, *paths, ids=None, strategy="selectin"):
+        """
+        returns the objects of cls (only those whose id is in ids if given)
+        by key, like all(cls), with the relationships named in paths
+        loaded up front: "cities" or a chain such as "cities.places".
+        strategy is "selectin" (one more SELECT per relationship) or
+        "joined" (LEFT OUTER JOINs in the same SELECT)
+        """
+        loaders = {"selectin": selectinload, "joined": joinedload}
+        cls = classes.get(cls, cls)
+        configure_mappers()
+        query = self.__session.query(cls)
+        for path in paths:
+            option, owner = None, cls
+            for name in path.split("."):
+                attr = getattr(owner, name)
+                if option is None:
+                    option = loaders[strategy](attr)
+                else:
+                    option = getattr(option, strategy + "load")(attr)
+                owner = attr.property.mapper.class_
+            query = query.options(option)
+        if ids is not None:
+            query = query.filter(cls.id.in_(list(ids)))
+        return {obj.__class__.__name__ + '.' + obj.id: obj
+                for obj in query.all()}
+
+    def search(self, states=None, cities=None, amenities=None,
+               order_by=None, after=None, limit=None, fields=None):
+        """
+        Returns the places in the cities of states or in cities, or all
+        places if neither is given, that have every amenity of amenities,
+        selected by a single query; order_by, after and limit select a
+        page of them with ORDER BY and LIMIT as page() does, and fields
+        the only columns selected besides the id
+        """
+        from models.place import place_amenity
+        query = self.__session.query(Place).options(
+            *self.__only(Place, fields, order_by))
+        where = []
+        if states:
+            query = query.join(City, Place.city_id == City.id)
+            where.append(City.state_id.in_(set(states)))
+        if cities:
+            where.append(Place.city_id.in_(set(cities)))
+        if where:
+            query = query.filter(or_(*where))
+        if amenities:
+            ids = set(amenities)
+            amenity_id = place_amenity.c.amenity_id
+            having_all = (select(place_amenity.c.place_id)
+                          .where(amenity_id.in_(ids))
+                          .group_by(place_amenity.c.place_id)
+                          .having(func.count(amenity_id.distinct()) ==
+                                  len(ids)))
+            query = query.filter(Place.id.in_(having_all))
+        return self.__page(query, Place, order_by, after, limit).all()
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
@@ -67,7 +184,19 @@ class DBStorage:
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
+        versions.metadata.create_all(self.__engine)
+        try:
+            with self.__engine.begin() as conn:
+                known = set(conn.execute(select(versions.c.name)).scalars())
+                now = datetime.utcnow()
+                missing = [{"name": name, "version": 0, "updated_at": now}
+                           for name in classes if name not in known]
+                if missing:
+                    conn.execute(versions.insert(), missing)
+        except sqlalchemy.exc.IntegrityError:
+            pass
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "before_flush", self.__bump)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
@@ -75,32 +204,129 @@ class DBStorage:
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
+    def related(self, cls, attr, id, order_by=None, after=None, limit=None,
+                fields=None):
+        """
+        Returns the list of objects of cls whose attribute attr holds id;
+        order_by, after and limit select a page of them, and fields the
+        only columns selected besides the id
+        """
+        cls = classes.get(cls, cls)
+        query = self.__session.query(cls).filter(getattr(cls, attr) == id)
+        query = query.options(*self.__only(cls, fields, order_by))
+        return self.__page(query, cls, order_by, after, limit).all()
+
+    def version(self, cls):
+        """
+        Returns a tag that changes whenever an object of cls is added,
+        changed or deleted, and the time of the last such change
+        """
+        cls = classes.get(cls, cls)
+        row = self.__session.execute(
+            select(versions.c.version, versions.c.updated_at)
+            .where(versions.c.name == cls.__name__)).first()
+        if row is None:
+            return "0", datetime(1970, 1, 1)
+        return ("{}.{}".format(row.version, row.updated_at.isoformat()),
+                row.updated_at)
+
+    def get(self, cls, id, fields=None):
         """
         Returns the object based on the class name and its ID, or
-        None if not found
+        None if not found; fields names the only columns selected besides
+        the id
         """
         if cls not in classes.values():
             return None
 
-        all_cls = models.storage.all(cls)
-        for value in all_cls.values():
-            if (value.id == id):
-                return value
-
-        return None
+        return self.__session.get(cls, id, options=self.__only(cls, fields))
 
     def count(self, cls=None):
         """
         count the number of objects in storage
         """
-        all_class = classes.values()
-
         if not cls:
-            count = 0
-            for clas in all_class:
-                count += len(models.storage.all(clas).values())
+            return sum(self.count(clas) for clas in classes.values())
+        cls = classes.get(cls, cls)
+        if cls not in classes.values():
+            return 0
+        return self.__session.query(func.count(cls.id)).scalar()
+
+    def __bump(self, session, flush_context, instances):
+        """
+        adds one to the version of the classes of the objects about to be
+        flushed, and of those of the objects deleted along with them
+        """
+        names = {type(obj).__name__ for obj in session.new}
+        names.update(type(obj).__name__ for obj in session.dirty
+                     if session.is_modified(obj))
+        deleted = set()
+        pending = [type(obj).__name__ for obj in session.deleted]
+        while pending:
+            name = pending.pop()
+            if name not in deleted:
+                deleted.add(name)
+                pending.extend(dependents.get(name, ()))
+        names |= deleted
+        now = datetime.utcnow()
+        for name in sorted(names & set(classes)):
+            session.execute(versions.update()
+                            .where(versions.c.name == name)
+                            .values(version=versions.c.version + 1,
+                                    updated_at=now))
+
+    def __only(self, cls, fields, order_by=None):
+        """
+        returns the loader options selecting only the id and the columns
+        of cls named in fields or order_by, none when fields is None
+        """
+        if fields is None:
+            return []
+        names = {"id", *fields}
+        if order_by is not None:
+            names.add(order_by.lstrip("-"))
+        return [load_only(*[getattr(cls, column.key)
+                            for column in cls.__mapper__.column_attrs
+                            if column.key in names])]
+
+    def __page(self, query, cls, order_by=None, after=None, limit=None):
+        """
+        returns query ordered by the column order_by of cls then id
+        (descending when order_by starts with "-"), past the (value, id)
+        cursor after, and limited to limit rows
+        """
+        if order_by is None and after is None and limit is None:
+            return query
+        order_by = order_by or "id"
+        descending = order_by.startswith("-")
+        column = getattr(cls, order_by.lstrip("-"))
+        if after is not None:
+            value, id = after
+            if descending:
+                query = query.filter(or_(column < value, and_(
+                    column == value, cls.id < id)))
+            else:
+                query = query.filter(or_(column > value, and_(
+                    column == value, cls.id > id)))
+        if descending:
+            query = query.order_by(column.desc(), cls.id.desc())
         else:
-            count = len(models.storage.all(cls).values())
+            query = query.order_by(column, cls.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
 
-        return count
+    def __pool_listener(self, counter):
+        """returns a pool event listener adding one to counter"""
+        def listener(*args):
+            """counts one more pool event"""
+            with self.__pool_lock:
+                self.__pool_counts[counter] += 1
+                if counter == "checkouts":
+                    checkedout = getattr(self.__engine.pool, "checkedout",
+                                         None)
+                    if checkedout is not None:
+                        self.__pool_counts["peak_checkedout"] = max(
+                            self.__pool_counts["peak_checkedout"],
+                            checkedout())
+        return listener
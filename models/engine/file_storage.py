@@ -3,9 +3,18 @@
 Contains the FileStorage class
 """
 
+import bisect
+from datetime import datetime
+import heapq
 import json
 import models
+import multiprocessing
+import os
+import re
+import threading
+import uuid
 from models.amenity import Amenity
+from models.engine import columnar
 from models.base_model import BaseModel
 from models.city import City
 from models.place import Place
@@ -14,91 +23,767 @@ from models.state import State
 from models.user import User
 from hashlib import md5
 
+decoder = json.JSONDecoder()
+whitespace = re.compile(r"[ \t\n\r]*")
+nonzero = re.compile(b"[^\x00]")
+# the numbers of the bits set in each byte value
+byte_bits = [tuple(bit for bit in range(8) if value >> bit & 1)
+             for value in range(256)]
+
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# attributes holding the id of a parent object, by class name
+relations = {"City": ("state_id",), "Place": ("city_id", "user_id"),
+             "Review": ("place_id", "user_id")}
+
+
+def sort_key(attr):
+    """
+    returns a function giving the (value of attr, id) of an object, with
+    None values before all others as the databases order NULLs
+    """
+    def key(obj):
+        """returns the position of obj in the order of attr then id"""
+        value = getattr(obj, attr, None)
+        return (value is not None, value, obj.id)
+    return key
+
+
+def page(objs, order_by=None, after=None, limit=None):
+    """
+    Returns objs ordered by the attribute order_by then id (descending
+    when order_by starts with "-"), keeping only those past after, the
+    (value, id) of the last object of the previous page, and at most
+    limit of them. A page is picked with a heap of limit objects, so objs
+    is neither copied nor sorted as a whole; objs are returned as they
+    are when no order, cursor or limit is asked for
+    """
+    if order_by is None and after is None and limit is None:
+        return list(objs)
+    order_by = order_by or "id"
+    descending = order_by.startswith("-")
+    key = sort_key(order_by.lstrip("-"))
+    if after is not None:
+        start = (after[0] is not None,) + tuple(after)
+        if descending:
+            objs = (obj for obj in objs if key(obj) < start)
+        else:
+            objs = (obj for obj in objs if key(obj) > start)
+    if limit is None:
+        return sorted(objs, key=key, reverse=descending)
+    if descending:
+        return heapq.nlargest(limit, objs, key=key)
+    return heapq.nsmallest(limit, objs, key=key)
+
+
+def all_stored(storage, cls, ids):
+    """returns True if every id of ids is that of an object of cls"""
+    return all(storage.get(cls, id) is not None for id in ids)
+
+
+def search_places(storage, states=None, cities=None, amenities=None,
+                  order_by=None, after=None, limit=None):
+    """
+    Returns the places of storage in the cities of states or in cities,
+    or all places if neither is given, that have every amenity of
+    amenities, walking the parent indexes of storage; ids of states and
+    cities not in storage are skipped, ids of amenities not in storage
+    match no place. order_by, after and limit select a page of them as
+    page() does
+    """
+    if amenities and not all_stored(storage, Amenity, amenities):
+        return []
+    if states or cities:
+        # ordered sets keyed by id: the cities of states then cities, and
+        # each place once, in the order it is first reached
+        city_ids = {}
+        for state_id in dict.fromkeys(states or ()):
+            if storage.get(State, state_id) is None:
+                continue
+            for city in storage.related(City, "state_id", state_id):
+                city_ids.setdefault(city.id)
+        for city_id in cities or ():
+            if storage.get(City, city_id) is not None:
+                city_ids.setdefault(city_id)
+        places = {}
+        for city_id in city_ids:
+            for place in storage.related(Place, "city_id", city_id):
+                places.setdefault(place.id, place)
+        places = places.values()
+    else:
+        places = storage.all(Place).values()
+    if amenities:
+        wanted = set(amenities)
+        places = (place for place in places
+                  if wanted.issubset(place.amenity_ids))
+    return page(places, order_by, after, limit)
+
+
+# the ', "<class name>.' that separates two records in the JSON file
+record_start = re.compile(b', "(?:' + "|".join(classes).encode() + b')\\.')
+
+
+def load_shard(path, start, end):
+    """
+    returns the (key, object) pairs of the records written between the
+    byte offsets start and end of the JSON file at path
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start).rstrip()
+    if data.endswith(b","):
+        data = data[:-1]
+    jo = json.loads(b"{" + data + b"}")
+    return [(key, classes[value["__class__"]](**value))
+            for key, value in jo.items()]
+
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
-    # string - path to the JSON file
-    __file_path = "file.json"
+    # string - format of the snapshot on disk, "json" or "columnar"
+    __format = os.getenv("HBNB_FILE_FORMAT", "json")
+    # string - path to the JSON file, or to the columnar snapshot
+    __file_path = "file.col" if __format == "columnar" else "file.json"
+    # string - path to the journal of records appended since the snapshot
+    __journal_path = __file_path + ".log"
+    # boolean - append changes to the journal instead of rewriting the file
+    __journal = os.getenv("HBNB_FILE_JOURNAL") == "1"
+    # integer - journal size in bytes past which save() compacts it
+    __journal_max = int(os.getenv("HBNB_FILE_JOURNAL_MAX", 4194304))
+    # float - seconds during which saves are batched into one write and fsync
+    __fsync_window = float(os.getenv("HBNB_FILE_FSYNC_WINDOW", 0))
+    # threading.Timer - the batched write waiting for the window to end
+    __timer = None
+    # list - the threading.Event set once that batch is written and
+    # fsynced, then the exception raised writing it or None
+    __batch = None
+    # threading.RLock - serializes writes and reloads between threads
+    __lock = threading.RLock()
+    # integer - processes building the objects when reading the JSON file
+    __reload_workers = int(os.getenv("HBNB_RELOAD_WORKERS", 0))
+    # integer - JSON file size in bytes from which the workers are used
+    __reload_parallel_min = 1048576
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects grouped by <class name>
+    __by_class = {}
+    # dictionary - the sorted keys of the objects of a class by <class
+    # name>, and of the objects under a parent id by (<class name>,
+    # <attribute>, <parent id>), for those paged through so far
+    __sorted_keys = {}
+    # dictionary - the same objects grouped by (<class name>, <attribute>)
+    # then by the parent id stored in that attribute
+    __by_parent = {}
+    # dictionary - row number of every place, and lists - the key of the
+    # place of every row number, None for the free rows listed in
+    # __free_rows, and the tuple of the amenity ids whose bitmaps have the
+    # bit of the row set; rows are the bits of the amenity bitmaps
+    __rows = {}
+    __row_keys = []
+    __row_amenities = []
+    __free_rows = []
+    # dictionary - bytearray bitmap of the rows of the places having the
+    # amenity, by amenity id, and set - ids of the amenities deleted since
+    # their bitmap was dropped
+    __by_amenity = {}
+    __dropped = set()
+    # dictionary - objects changed since the last save, None once deleted
+    __changed = {}
+    # string - tells the versions of this process from those of others
+    __epoch = uuid.uuid4().hex[:8]
+    # dictionary - number of objects added, changed or deleted by <class
+    # name>, and the (number, time) at which version() first saw it
+    __versions = {}
+    __seen = {}
+    # dictionary - (object, '"<key>": {...}' JSON text) of objects written
+    # out and not changed since, so saves only re-serialize dirty objects
+    __serialized = {}
+    # tuple - stat of the JSON file as last read or written
+    __file_stat = None
+    # tuple - inode of the journal and how far into it has been read
+    __journal_pos = (None, 0)
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def all(self, cls=None, order_by=None, after=None, limit=None,
+            fields=None):
+        """
+        returns the dictionary __objects, or the objects of one class;
+        order_by, after and limit select a page of the objects of cls as
+        page() does, sliced from the sorted keys when ordered by id.
+        Objects are held whole, so fields has nothing to leave out
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            objs = self.__by_class.get(cls, {})
+            if order_by is None and after is None and limit is None:
+                return dict(objs)
+            if order_by not in (None, "id"):
+                return {cls + "." + obj.id: obj
+                        for obj in page(objs.values(), order_by, after, limit)}
+            keys = self.__slice(cls, objs, cls, after, limit)
+            return {key: objs[key] for key in keys}
         return self.__objects
 
+    def eager(self, cls, *paths, ids=None, strategy=None):
+        """
+        returns the objects of cls (only those whose id is in ids if given)
+        by key, like all(cls); relationships are read from the parent
+        indexes, so paths and strategy have nothing to load up front
+        """
+        if ids is None:
+            return self.all(cls)
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        objs = (self.get(cls, id) for id in ids)
+        return {obj.__class__.__name__ + "." + obj.id: obj
+                for obj in objs if obj is not None}
+
+    def search(self, states=None, cities=None, amenities=None,
+               order_by=None, after=None, limit=None, fields=None):
+        """
+        Returns the places in the cities of states or in cities, or all
+        places if neither is given, that have every amenity of amenities;
+        the amenity filter ANDs the bitmaps of the amenities, then checks
+        the amenity_ids of the places found in case one was changed in
+        place. order_by, after and limit select a page of them as page()
+        does (fields is ignored, as in all())
+        """
+        if not amenities:
+            return search_places(self, states, cities, None,
+                                 order_by, after, limit)
+        if not all_stored(self, Amenity, amenities):
+            return []
+        wanted = set(amenities)
+        bits = -1
+        for id in wanted:
+            bits &= int.from_bytes(self.__by_amenity.get(id, b""), "little")
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        row_keys = self.__row_keys
+        keys = [row_keys[(match.start() << 3) + bit]
+                for match in nonzero.finditer(data)
+                for bit in byte_bits[data[match.start()]]]
+        places = (self.__objects[key] for key in keys if key is not None)
+        if states or cities:
+            keys = {place.id for place in places}
+            places = (place for place in search_places(self, states, cities)
+                      if place.id in keys)
+        return page((place for place in places
+                     if wanted.issubset(place.amenity_ids)),
+                    order_by, after, limit)
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock:
+                self.__link(key, obj)
+                self.__changed[key] = obj
+                self.__serialized.pop(key, None)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            if key == "password":
-                json_objects[key].decode()
-            json_objects[key] = self.__objects[key].to_dict(save_fs=1)
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """
+        writes the changes since the last save, right away or together
+        with the saves that follow within __fsync_window seconds; either
+        way it returns once they are written and fsynced
+        """
+        if self.__fsync_window <= 0:
+            self.flush()
+            return
+        with self.__lock:
+            if self.__timer is None:
+                FileStorage.__batch = [threading.Event(), None]
+                FileStorage.__timer = threading.Timer(self.__fsync_window,
+                                                      self.flush)
+                self.__timer.start()
+            batch = self.__batch
+        batch[0].wait()
+        if batch[1] is not None:
+            raise batch[1]
+
+    def flush(self):
+        """
+        writes the changes since the last flush, either to the journal
+        or by rewriting the whole JSON file, then wakes up the saves
+        waiting on the batch
+        """
+        with self.__lock:
+            batch = None
+            if self.__timer is not None:
+                self.__timer.cancel()
+                batch = self.__batch
+                FileStorage.__timer = FileStorage.__batch = None
+            try:
+                if not self.__journal:
+                    self.compact()
+                else:
+                    self.__append()
+                    if (os.path.getsize(self.__journal_path) >
+                            self.__journal_max):
+                        self.compact()
+            except Exception as error:
+                if batch is not None:
+                    batch[1] = error
+                raise
+            finally:
+                if batch is not None:
+                    batch[0].set()
+
+    def compact(self):
+        """serializes __objects to the snapshot file (path: __file_path)"""
+        with self.__lock:
+            FileStorage.__changed = {}
+            items = list(self.__objects.items())
+            tmp_path = "{}.{}.tmp".format(self.__file_path, os.getpid())
+            with open(tmp_path, 'wb') as f:
+                if self.__format == "columnar":
+                    columnar.dump(((key, obj.to_dict(save_fs=1))
+                                   for key, obj in items), f)
+                else:
+                    f.write(b"{")
+                    for i, (key, obj) in enumerate(items):
+                        if i:
+                            f.write(b", ")
+                        f.write(self.__fragment(key, obj).encode())
+                    f.write(b"}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.__file_path)
+            self.__sync_dir(self.__file_path)
+            FileStorage.__file_stat = self.__stat(self.__file_path)
+            if os.path.exists(self.__journal_path):
+                os.remove(self.__journal_path)
+            FileStorage.__journal_pos = (None, 0)
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
-        try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
-            pass
+        """
+        deserializes the snapshot file to __objects if it changed since
+        it was last read, then replays the journal records not read yet
+        """
+        with self.__lock:
+            try:
+                stat = self.__stat(self.__file_path)
+                if stat != self.__file_stat:
+                    shards = None
+                    if (self.__reload_workers > 1 and
+                            self.__format == "json" and
+                            stat[1] >= self.__reload_parallel_min):
+                        shards = self.__load_parallel(stat[1])
+                    if shards is not None:
+                        for shard in shards:
+                            for key, obj in shard:
+                                self.__link(key, obj)
+                    elif self.__format == "columnar":
+                        with open(self.__file_path, 'rb') as f:
+                            for key, value in columnar.load(f):
+                                cls = classes[value["__class__"]]
+                                self.__link(key, cls(**value))
+                    else:
+                        with open(self.__file_path, 'r') as f:
+                            for key, value in self.__items(f):
+                                cls = classes[value["__class__"]]
+                                self.__link(key, cls(**value))
+                    FileStorage.__file_stat = stat
+                    FileStorage.__journal_pos = (None, 0)
+            except:
+                pass
+            try:
+                self.__replay()
+            except:
+                pass
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock:
+                if key in self.__objects:
+                    self.__unlink(key, self.__objects[key])
+                    self.__changed[key] = None
+                    self.__drop(key)
 
     def close(self):
         """call reload() method for deserializing the JSON file to objects"""
         self.reload()
 
-    def get(self, cls, id):
+    def get(self, cls, id, fields=None):
         """
         Returns the object based on the class name and its ID, or
-        None if not found
+        None if not found (fields is ignored, as in all())
         """
         if cls not in classes.values():
             return None
 
-        all_cls = models.storage.all(cls)
-        for value in all_cls.values():
-            if (value.id == id):
-                return value
-
-        return None
+        key = "{}.{}".format(cls.__name__, id)
+        return self.__by_class.get(cls.__name__, {}).get(key)
 
     def count(self, cls=None):
         """
         count the number of objects in storage
         """
-        all_class = classes.values()
-
         if not cls:
-            count = 0
-            for clas in all_class:
-                count += len(models.storage.all(clas).values())
-        else:
-            count = len(models.storage.all(cls).values())
+            return len(self.__objects)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return len(self.__by_class.get(cls, {}))
+
+    def version(self, cls):
+        """
+        Returns a tag that changes whenever an object of cls is added,
+        changed or deleted, and the time that change was first seen
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        count = self.__versions.get(cls, 0)
+        seen = self.__seen.get(cls)
+        if seen is None or seen[0] != count:
+            seen = self.__seen[cls] = (count, datetime.utcnow())
+        return "{}.{}".format(self.__epoch, count), seen[1]
+
+    def related(self, cls, attr, id, order_by=None, after=None, limit=None,
+                fields=None):
+        """
+        Returns the list of objects of cls whose attribute attr holds id;
+        order_by, after and limit select a page of them as page() does,
+        sliced from their sorted keys when ordered by id (fields is
+        ignored, as in all())
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        children = self.__by_parent.get((cls, attr), {}).get(id, {})
+        if order_by not in (None, "id") or (after is None and limit is None):
+            return page(children.values(), order_by, after, limit)
+        if not children:
+            return []
+        keys = self.__slice((cls, attr, id), children, cls, after, limit)
+        return [children[key] for key in keys]
 
-        return count
+    def touch(self, obj, name, value):
+        """
+        Marks obj as changed and moves it between the parent indexes
+        before its attribute name is set to value
+        """
+        cls = obj.__class__.__name__
+        key = "{}.{}".format(cls, getattr(obj, "id", None))
+        # objects not stored, such as those being built, skip the lock
+        if self.__objects.get(key) is not obj:
+            return
+        with self.__lock:
+            if self.__objects.get(key) is not obj:
+                return
+            self.__changed[key] = obj
+            self.__serialized.pop(key, None)
+            if name in relations.get(cls, ()):
+                self.__unindex(key, cls, name, getattr(obj, name, None))
+                self.__index(key, obj, cls, name, value)
+            elif name == "amenity_ids" and key in self.__rows:
+                self.__unmark(self.__rows[key])
+                self.__mark(self.__rows[key], value)
+
+    def touched(self, obj):
+        """
+        Changes the version of the class of obj once an attribute of obj
+        is set, so no reader sees the new version with the old value
+        """
+        cls = obj.__class__.__name__
+        key = "{}.{}".format(cls, getattr(obj, "id", None))
+        if self.__objects.get(key) is not obj:
+            return
+        with self.__lock:
+            self.__versions[cls] = self.__versions.get(cls, 0) + 1
+
+    def __append(self):
+        """appends one journal record per object changed since last save"""
+        ino, pos = self.__journal_pos
+        changed = self.__changed
+        FileStorage.__changed = {}
+        with open(self.__journal_path, 'a') as f:
+            start = f.tell()
+            for key, obj in changed.items():
+                if obj is None:
+                    f.write(json.dumps({key: None}) + "\n")
+                else:
+                    f.write("{" + self.__fragment(key, obj) + "}\n")
+            f.flush()
+            os.fsync(f.fileno())
+            end = f.tell()
+            st_ino = os.fstat(f.fileno()).st_ino
+        if start == 0 or (ino == st_ino and pos == start):
+            FileStorage.__journal_pos = (st_ino, end)
+
+    def __fragment(self, key, obj):
+        """returns the '"<key>": {...}' JSON text of obj, cached"""
+        entry = self.__serialized.get(key)
+        if entry is None or entry[0] is not obj:
+            text = json.dumps(key) + ": " + json.dumps(obj.to_dict(save_fs=1))
+            entry = (obj, text)
+            self.__serialized[key] = entry
+        return entry[1]
+
+    def __replay(self):
+        """applies the journal records appended since the last replay"""
+        ino, pos = self.__journal_pos
+        with open(self.__journal_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if ino != st.st_ino or st.st_size < pos:
+                pos = 0
+            f.seek(pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                pos += len(line)
+                for key, value in json.loads(line.decode()).items():
+                    if value is None:
+                        if key in self.__objects:
+                            self.__unlink(key, self.__objects[key])
+                            self.__drop(key)
+                    else:
+                        self.__link(key, classes[value["__class__"]](**value))
+        FileStorage.__journal_pos = (st.st_ino, pos)
+
+    def __load_parallel(self, size):
+        """
+        splits the JSON file into one shard per worker and builds their
+        objects in a process pool, returns None if it can not be done
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            return None
+        bounds = self.__shard_bounds(size, self.__reload_workers)
+        if bounds is None:
+            return None
+        ranges = [(self.__file_path, bounds[i], bounds[i + 1])
+                  for i in range(len(bounds) - 1)]
+        try:
+            ctx = multiprocessing.get_context("fork")
+            with ctx.Pool(len(ranges)) as pool:
+                return pool.starmap(load_shard, ranges)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def __shard_bounds(self, size, count):
+        """
+        returns the byte offsets at which records start in the JSON file,
+        about size / count bytes apart, then the offset of its last brace
+        """
+        with open(self.__file_path, 'rb') as f:
+            head = f.read(64)
+            f.seek(max(0, size - 64))
+            tail = f.read()
+            if (not head.lstrip().startswith(b"{") or
+                    not tail.rstrip().endswith(b"}")):
+                return None
+            bounds = [len(head) - len(head.lstrip()) + 1]
+            end = size - (len(tail) - len(tail.rstrip())) - 1
+            for i in range(1, count):
+                offset = max(size * i // count, bounds[-1])
+                f.seek(offset)
+                window = b""
+                match = None
+                while match is None:
+                    chunk = f.read(65536)
+                    if not chunk:
+                        break
+                    window += chunk
+                    match = record_start.search(window)
+                if match is None or offset + match.start() + 2 >= end:
+                    break
+                bounds.append(offset + match.start() + 2)
+        bounds.append(end)
+        return bounds
+
+    @staticmethod
+    def __items(f, size=65536):
+        """
+        yields the (key, value) pairs of the JSON object in the file f
+        one at a time, reading it size characters at a time
+        """
+        buf, pos, eof = "", 0, False
+        state = "{"
+        while True:
+            pos = whitespace.match(buf, pos).end()
+            if pos == len(buf):
+                if eof:
+                    raise ValueError("unexpected end of JSON data")
+                chunk = f.read(size)
+                buf, pos, eof = chunk, 0, not chunk
+                continue
+            char = buf[pos]
+            if state == "{":
+                if char != "{":
+                    raise ValueError("expected '{'")
+                state, pos = "key or }", pos + 1
+            elif state == ":":
+                if char != ":":
+                    raise ValueError("expected ':'")
+                state, pos = "value", pos + 1
+            elif state == ", or }" or (state == "key or }" and char == "}"):
+                if char == "}":
+                    return
+                if char != ",":
+                    raise ValueError("expected ',' or '}'")
+                state, pos = "key", pos + 1
+            else:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    if end == len(buf) and not eof:
+                        raise ValueError("the value may go on")
+                except ValueError:
+                    if eof:
+                        raise
+                    chunk = f.read(size)
+                    buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+                    continue
+                pos = end
+                if state == "value":
+                    yield key, value
+                    state = ", or }"
+                elif char == '"':
+                    key, state = value, ":"
+                else:
+                    raise ValueError("expected a key")
+
+    @staticmethod
+    def __sync_dir(path):
+        """fsyncs the directory holding path so a rename into it lasts"""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def __stat(path):
+        """returns what identifies a version of the file at path"""
+        st = os.stat(path)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def __link(self, key, obj):
+        """adds obj to __objects and to every index"""
+        old = self.__objects.get(key)
+        if old is not None and old is not obj:
+            self.__unlink(key, old)
+        cls = obj.__class__.__name__
+        self.__versions[cls] = self.__versions.get(cls, 0) + 1
+        self.__objects[key] = obj
+        members = self.__by_class.setdefault(cls, {})
+        if key not in members and cls in self.__sorted_keys:
+            bisect.insort(self.__sorted_keys[cls], key)
+        members[key] = obj
+        for attr in relations.get(cls, ()):
+            self.__index(key, obj, cls, attr, getattr(obj, attr, None))
+        if cls == "Amenity" and obj.id in self.__dropped:
+            self.__dropped.discard(obj.id)
+            for row, ids in enumerate(self.__row_amenities):
+                if obj.id in ids:
+                    self.__mark(row, ids)
+        if cls == "Place":
+            if key in self.__rows:
+                # stored again, as by save(): keep its row
+                row = self.__rows[key]
+                self.__unmark(row)
+            elif self.__free_rows:
+                row = self.__free_rows.pop()
+                self.__row_keys[row] = key
+            else:
+                row = len(self.__row_keys)
+                self.__row_keys.append(key)
+                self.__row_amenities.append(())
+            self.__rows[key] = row
+            self.__mark(row, getattr(obj, "amenity_ids", None))
+
+    def __unlink(self, key, obj):
+        """removes obj from __objects and from every index"""
+        cls = obj.__class__.__name__
+        self.__versions[cls] = self.__versions.get(cls, 0) + 1
+        del self.__objects[key]
+        self.__serialized.pop(key, None)
+        if self.__by_class.get(cls, {}).pop(key, None) is not None:
+            keys = self.__sorted_keys.get(cls)
+            if keys is not None:
+                del keys[bisect.bisect_left(keys, key)]
+        for attr in relations.get(cls, ()):
+            self.__unindex(key, cls, attr, getattr(obj, attr, None))
+        if key in self.__rows:
+            row = self.__rows.pop(key)
+            self.__unmark(row)
+            self.__row_keys[row] = None
+            self.__free_rows.append(row)
+
+    def __slice(self, group, members, cls, after, limit):
+        """
+        returns the first limit keys of members, the objects of cls of the
+        group of __sorted_keys, past the id of the (value, id) cursor
+        after; the keys are sorted on the first page and kept sorted
+        """
+        keys = self.__sorted_keys.get(group)
+        if keys is None:
+            keys = self.__sorted_keys[group] = sorted(members)
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(keys, cls + "." + after[1])
+        return keys[start:None if limit is None else start + limit]
+
+    def __index(self, key, obj, cls, attr, id):
+        """files obj under the parent id of its attribute attr"""
+        parents = self.__by_parent.setdefault((cls, attr), {})
+        children = parents.setdefault(id, {})
+        if key not in children and (cls, attr, id) in self.__sorted_keys:
+            bisect.insort(self.__sorted_keys[cls, attr, id], key)
+        children[key] = obj
+
+    def __unindex(self, key, cls, attr, id):
+        """drops key from under the parent id of attribute attr"""
+        parents = self.__by_parent.get((cls, attr), {})
+        children = parents.get(id)
+        if children is not None:
+            if children.pop(key, None) is not None:
+                keys = self.__sorted_keys.get((cls, attr, id))
+                if keys is not None:
+                    del keys[bisect.bisect_left(keys, key)]
+            if not children:
+                del parents[id]
+                self.__sorted_keys.pop((cls, attr, id), None)
+
+    def __mark(self, row, amenity_ids):
+        """
+        sets the bit of row in the bitmap of each amenity of amenity_ids,
+        and records those amenities as the ones of row
+        """
+        ids = ()
+        if isinstance(amenity_ids, (list, tuple, set)):
+            ids = tuple(amenity_ids)
+        byte, bit = row >> 3, 1 << (row & 7)
+        for id in ids:
+            bitmap = self.__by_amenity.setdefault(id, bytearray())
+            if len(bitmap) <= byte:
+                bitmap.extend(bytes(byte + 1 - len(bitmap)))
+            bitmap[byte] |= bit
+        self.__row_amenities[row] = ids
+
+    def __drop(self, key):
+        """
+        drops the bitmap of the amenity deleted from under key; it is
+        built again from the rows if an amenity with the same id comes back
+        """
+        if key.startswith("Amenity."):
+            id = key[len("Amenity."):]
+            if self.__by_amenity.pop(id, None) is not None:
+                self.__dropped.add(id)
+
+    def __unmark(self, row):
+        """
+        clears the bit of row in the bitmaps it was set in, as recorded by
+        __mark whatever the amenity_ids of the place hold now
+        """
+        byte, mask = row >> 3, ~(1 << (row & 7)) & 0xff
+        for id in self.__row_amenities[row]:
+            bitmap = self.__by_amenity.get(id)
+            if bitmap is not None and len(bitmap) > byte:
+                bitmap[byte] &= mask
+        self.__row_amenities[row] = ()
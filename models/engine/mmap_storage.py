@@ -0,0 +1,451 @@
+#!/usr/bin/python3
+"""
+Contains the MmapStorage class
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+import json
+import mmap
+import os
+import struct
+import threading
+import uuid
+import weakref
+from models.engine.file_storage import (classes, page, relations,
+                                        search_places)
+
+MAGIC = b"HBNBIDX1"
+# where the key and the parent tables start, their numbers of rows and
+# the width of their sort fields, then MAGIC again, at the end of the file
+footer = struct.Struct("<QIIQII8s")
+# offset and length of a record, after the key in the key table
+row = struct.Struct("<QI")
+# number of a row of the key table, after the field in the parent table
+ref = struct.Struct("<I")
+
+
+def parent_field(cls, attr, id):
+    """returns the parent table field of the objects of cls under id"""
+    return "{}.{}\x01{}\x01".format(cls, attr, id).encode()
+
+
+class MmapStorage:
+    """
+    keeps instances in an indexed snapshot file that is memory-mapped,
+    and decodes each object only when it is first asked for
+
+    The snapshot holds MAGIC, one JSON record per object, the key table
+    (every key padded with NUL bytes followed by the offset and length of
+    its record, sorted by key), the parent table (b"<class name>.<attr>\\1
+    <parent id>\\1" padded, followed by the row of the child in the key
+    table, sorted) and the footer. Both tables are binary searched in the
+    mapping, so nothing is read at startup and the worker processes of a
+    host share the pages of the file instead of each holding a copy.
+    """
+
+    # string - path to the indexed snapshot file
+    __file_path = "file.idx"
+    # string - JSON file imported when there is no snapshot file yet
+    __import_path = "file.json"
+    # integer - decoded objects kept alive by the cache at most
+    __cache_size = int(os.getenv("HBNB_MMAP_CACHE", 1024))
+    # threading.RLock - serializes writes and reloads between threads
+    __lock = threading.RLock()
+    # mmap.mmap - the snapshot file as last read or written
+    __map = None
+    # tuple - the footer of the snapshot file as last read or written
+    __tables = None
+    # tuple - stat of the snapshot file as last read or written
+    __file_stat = None
+    # dictionary - objects changed since the last save, None once deleted
+    __changed = {}
+    # OrderedDict - the most recently used decoded objects by key
+    __cache = OrderedDict()
+    # WeakValueDictionary - every decoded object still referenced by key
+    __live = weakref.WeakValueDictionary()
+    # string - tells the versions of this process from those of others
+    __epoch = uuid.uuid4().hex[:8]
+    # integer - snapshots written by other processes read so far
+    __generation = 0
+    # dictionary - number of objects added, changed or deleted by <class
+    # name>, and the (version, time) at which version() first saw it
+    __versions = {}
+    __seen = {}
+
+    def all(self, cls=None, order_by=None, after=None, limit=None,
+            fields=None):
+        """
+        returns a dictionary of all objects, or of the objects of cls;
+        order_by, after and limit select a page of them as page() does,
+        and only the objects of the page are decoded when ordered by id.
+        Records are decoded whole, so fields has nothing to leave out
+        """
+        if cls is not None and not isinstance(cls, str):
+            cls = cls.__name__
+        if order_by not in (None, "id"):
+            return {cls + "." + obj.id: obj for obj in
+                    page(self.all(cls).values(), order_by, after, limit)}
+        prefix = "" if cls is None else cls + "."
+        start = None if after is None else prefix + after[1]
+        with self.__lock:
+            lo, hi = self.__range(prefix.encode())
+            if start is not None:
+                lo = self.__lower(start.encode())
+            rows = self.__first(range(lo, hi), start, limit)
+            rows.extend((key, None, None)
+                        for key, obj in self.__changed.items()
+                        if obj is not None and key.startswith(prefix) and
+                        (start is None or key > start))
+            if order_by is not None or after is not None or limit is not None:
+                rows = sorted(rows)[:limit]
+            return {key: self.__decode(key, offset, length)
+                    for key, offset, length in rows}
+
+    def eager(self, cls, *paths, ids=None, strategy=None):
+        """
+        returns the objects of cls (only those whose id is in ids if given)
+        by key, like all(cls); relationships are read from the parent
+        table, so paths and strategy have nothing to load up front
+        """
+        if ids is None:
+            return self.all(cls)
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        objs = (self.get(cls, id) for id in ids)
+        return {obj.__class__.__name__ + "." + obj.id: obj
+                for obj in objs if obj is not None}
+
+    def search(self, states=None, cities=None, amenities=None,
+               order_by=None, after=None, limit=None, fields=None):
+        """
+        Returns the places in the cities of states or in cities, or all
+        places if neither is given, that have every amenity of amenities;
+        order_by, after and limit select a page of them (fields is
+        ignored, as in all())
+        """
+        return search_places(self, states, cities, amenities,
+                             order_by, after, limit)
+
+    def new(self, obj):
+        """adds obj to the objects written out by the next save"""
+        if obj is not None:
+            key = obj.__class__.__name__ + "." + obj.id
+            with self.__lock:
+                self.__live[key] = obj
+                self.__cache.pop(key, None)
+                self.__changed[key] = obj
+                self.__count(obj)
+
+    def save(self):
+        """
+        writes a new snapshot: the records of unchanged objects are copied
+        from the current one as they are, only changed objects are encoded
+        """
+        with self.__lock:
+            keys, parents = [], []
+            tmp_path = "{}.{}.tmp".format(self.__file_path, os.getpid())
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                for i in range(*self.__range(b"")):
+                    key, offset, length = self.__row(i)
+                    if key not in self.__changed:
+                        keys.append((key.encode(), f.tell(), length))
+                        f.write(self.__map[offset:offset + length])
+                for j in range(*self.__range(b"", True)):
+                    field, i = self.__parent(j)
+                    key = self.__row(i)[0]
+                    if key not in self.__changed:
+                        parents.append((field, key.encode()))
+                for key, obj in self.__changed.items():
+                    if obj is None:
+                        continue
+                    record = json.dumps(obj.to_dict(save_fs=1)).encode()
+                    keys.append((key.encode(), f.tell(), len(record) + 1))
+                    f.write(record + b"\n")
+                    cls = obj.__class__.__name__
+                    for attr in relations.get(cls, ()):
+                        id = getattr(obj, attr, None)
+                        if type(id) is str:
+                            parents.append((parent_field(cls, attr, id),
+                                            key.encode()))
+                keys.sort()
+                parents.sort()
+                numbers = {key: i for i, (key, _, _) in enumerate(keys)}
+                key_width = max([len(key) for key, _, _ in keys] or [0])
+                parent_width = max([len(field) for field, _ in parents] or [0])
+                keys_start = f.tell()
+                for key, offset, length in keys:
+                    f.write(key.ljust(key_width, b"\0"))
+                    f.write(row.pack(offset, length))
+                parents_start = f.tell()
+                for field, key in parents:
+                    f.write(field.ljust(parent_width, b"\0"))
+                    f.write(ref.pack(numbers[key]))
+                f.write(footer.pack(keys_start, len(keys), key_width,
+                                    parents_start, len(parents),
+                                    parent_width, MAGIC))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.__file_path)
+            MmapStorage.__changed = {}
+            self.__open()
+
+    def reload(self):
+        """
+        maps the snapshot file again if it changed since it was last read,
+        dropping the decoded objects that were not changed since
+        """
+        with self.__lock:
+            try:
+                stat = self.__stat(self.__file_path)
+            except OSError:
+                if self.__map is None and self.__import():
+                    self.save()
+                return
+            if stat == self.__file_stat:
+                return
+            try:
+                self.__open()
+            except (OSError, ValueError, struct.error):
+                return
+            MmapStorage.__generation += 1
+            MmapStorage.__cache = OrderedDict()
+            MmapStorage.__live = weakref.WeakValueDictionary()
+            for key, obj in self.__changed.items():
+                if obj is not None:
+                    self.__live[key] = obj
+
+    def delete(self, obj=None):
+        """deletes obj from the objects written out by the next save"""
+        if obj is not None:
+            key = obj.__class__.__name__ + '.' + obj.id
+            with self.__lock:
+                if self.__exists(key):
+                    self.__cache.pop(key, None)
+                    self.__live.pop(key, None)
+                    self.__changed[key] = None
+                    self.__count(obj)
+
+    def close(self):
+        """call reload() method for mapping the snapshot file again"""
+        self.reload()
+
+    def get(self, cls, id, fields=None):
+        """
+        Returns the object based on the class name and its ID, or
+        None if not found (fields is ignored, as in all())
+        """
+        if cls not in classes.values():
+            return None
+
+        key = "{}.{}".format(cls.__name__, id)
+        with self.__lock:
+            if key in self.__changed or key in self.__live:
+                return self.__decode(key, None, None)
+            i = self.__find(key)
+            return None if i is None else self.__decode(*self.__row(i))
+
+    def count(self, cls=None):
+        """
+        count the number of objects in storage
+        """
+        if cls and not isinstance(cls, str):
+            cls = cls.__name__
+        prefix = cls + "." if cls else ""
+        with self.__lock:
+            lo, hi = self.__range(prefix.encode())
+            total = hi - lo
+            for key, obj in self.__changed.items():
+                if key.startswith(prefix):
+                    total += ((obj is not None) -
+                              (self.__find(key) is not None))
+            return total
+
+    def related(self, cls, attr, id, order_by=None, after=None, limit=None,
+                fields=None):
+        """
+        Returns the list of objects of cls whose attribute attr holds id;
+        order_by, after and limit select a page of them as page() does,
+        and only the objects of the page are decoded when ordered by id
+        (fields is ignored, as in all())
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if order_by not in (None, "id"):
+            return page(self.related(cls, attr, id), order_by, after, limit)
+        start = None if after is None else cls + "." + after[1]
+        with self.__lock:
+            rows = []
+            if type(id) is str:
+                field = parent_field(cls, attr, id)
+                rows = self.__first((self.__parent(j)[1] for j in
+                                     range(*self.__range(field, True))),
+                                    start, limit)
+            rows.extend((key, None, None)
+                        for key, obj in self.__changed.items()
+                        if obj is not None and key.startswith(cls + ".") and
+                        getattr(obj, attr, None) == id and
+                        (start is None or key > start))
+            if order_by is not None or after is not None or limit is not None:
+                rows = sorted(rows)[:limit]
+            return [self.__decode(key, offset, length)
+                    for key, offset, length in rows]
+
+    def version(self, cls):
+        """
+        Returns a tag that changes whenever an object of cls is added,
+        changed or deleted, or another snapshot is read, and the time
+        that change was first seen
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        with self.__lock:
+            version = (self.__generation, self.__versions.get(cls, 0))
+            seen = self.__seen.get(cls)
+            if seen is None or seen[0] != version:
+                seen = self.__seen[cls] = (version, datetime.utcnow())
+        return "{}.{}.{}".format(self.__epoch, *version), seen[1]
+
+    def touch(self, obj, name, value):
+        """
+        Marks obj as changed, which keeps it out of the cache eviction
+        until it is written out by the next save
+        """
+        key = "{}.{}".format(obj.__class__.__name__, getattr(obj, "id", None))
+        with self.__lock:
+            if self.__live.get(key) is obj:
+                self.__changed[key] = obj
+                self.__cache.pop(key, None)
+
+    def touched(self, obj):
+        """counts a change to obj once the attribute touched is set"""
+        key = "{}.{}".format(obj.__class__.__name__, getattr(obj, "id", None))
+        with self.__lock:
+            if self.__live.get(key) is obj:
+                self.__count(obj)
+
+    def __decode(self, key, offset, length):
+        """
+        returns the object stored under key, decoding its record at
+        offset if needed, and marks it as the most recently used
+        """
+        if key in self.__changed:
+            return self.__changed[key]
+        obj = self.__live.get(key)
+        if obj is None:
+            value = json.loads(self.__map[offset:offset + length].decode())
+            obj = classes[value["__class__"]](**value)
+            self.__live[key] = obj
+        self.__cache[key] = obj
+        self.__cache.move_to_end(key)
+        while len(self.__cache) > self.__cache_size:
+            self.__cache.popitem(last=False)
+        return obj
+
+    def __count(self, obj):
+        """adds one to the number of changes to the objects of obj's class"""
+        cls = obj.__class__.__name__
+        self.__versions[cls] = self.__versions.get(cls, 0) + 1
+
+    def __first(self, rows, start, limit):
+        """
+        returns the key, offset and length of the first limit rows of the
+        key table numbered in rows, in key order, whose key is past start
+        and whose object was not changed since the last save
+        """
+        found = []
+        for i in rows:
+            if limit is not None and len(found) == limit:
+                break
+            key, offset, length = self.__row(i)
+            if (start is None or key > start) and key not in self.__changed:
+                found.append((key, offset, length))
+        return found
+
+    def __exists(self, key):
+        """returns True if an object is stored under key"""
+        if key in self.__changed:
+            return self.__changed[key] is not None
+        return self.__find(key) is not None
+
+    def __open(self):
+        """maps the snapshot file and reads its footer"""
+        with open(self.__file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            new_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        tables = footer.unpack(new_map[-footer.size:])
+        if new_map[:len(MAGIC)] != MAGIC or tables[-1] != MAGIC:
+            new_map.close()
+            raise ValueError("not an indexed snapshot")
+        if self.__map is not None:
+            self.__map.close()
+        MmapStorage.__map = new_map
+        MmapStorage.__tables = tables
+        MmapStorage.__file_stat = (stat.st_ino, stat.st_size,
+                                   stat.st_mtime_ns)
+
+    def __import(self):
+        """reads the objects of the JSON file, returns True if it did"""
+        try:
+            with open(self.__import_path, 'r') as f:
+                jo = json.load(f)
+        except (OSError, ValueError):
+            return False
+        for key, value in jo.items():
+            self.new(classes[value["__class__"]](**value))
+        return True
+
+    def __row(self, i):
+        """returns the key, offset and length of row i of the key table"""
+        start, count, width = self.__tables[:3]
+        pos = start + i * (width + row.size)
+        offset, length = row.unpack_from(self.__map, pos + width)
+        key = self.__map[pos:pos + width].rstrip(b"\0").decode()
+        return key, offset, length
+
+    def __parent(self, j):
+        """returns the field and key table row of row j of the parents"""
+        start, count, width = self.__tables[3:6]
+        pos = start + j * (width + ref.size)
+        i, = ref.unpack_from(self.__map, pos + width)
+        return self.__map[pos:pos + width].rstrip(b"\0"), i
+
+    def __lower(self, target, parents=False):
+        """returns the first row of a table whose field is >= target"""
+        if self.__tables is None:
+            return 0
+        if parents:
+            start, count, width = self.__tables[3:6]
+            size = width + ref.size
+        else:
+            start, count, width = self.__tables[:3]
+            size = width + row.size
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = start + mid * size
+            if self.__map[pos:pos + width] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __range(self, prefix, parents=False):
+        """returns the first and past the last rows starting with prefix"""
+        return (self.__lower(prefix, parents),
+                self.__lower(prefix + b"\xff", parents))
+
+    def __find(self, key):
+        """returns the row of key in the key table, None if not there"""
+        i = self.__lower(key.encode())
+        if self.__tables is not None and i < self.__tables[1]:
+            if self.__row(i)[0] == key:
+                return i
+        return None
+
+    @staticmethod
+    def __stat(path):
+        """returns what identifies a version of the file at path"""
+        st = os.stat(path)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage
+from os import getenv
+from sqlalchemy import create_engine, event
+
+
+def set_pragmas(dbapi_connection, connection_record):
+    """turns on WAL journaling and foreign keys on a new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with a local SQLite database file"""
+
+    def make_engine(self):
+        """
+        returns the engine of the SQLite file HBNB_SQLITE_DB (hbnb.db by
+        default), in WAL mode so readers do not wait for the writer
+        """
+        HBNB_SQLITE_DB = getenv('HBNB_SQLITE_DB', 'hbnb.db')
+        HBNB_SQLITE_TIMEOUT = float(getenv('HBNB_SQLITE_TIMEOUT', 30))
+        engine = create_engine('sqlite:///{}'.format(HBNB_SQLITE_DB),
+                               connect_args={
+                                   'check_same_thread': False,
+                                   'timeout': HBNB_SQLITE_TIMEOUT})
+        event.listen(engine, "connect", set_pragmas)
+        return engine
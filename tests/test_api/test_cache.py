@@ -0,0 +1,371 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs, TestMemoryCache, TestDirectoryCache,
+TestMakeCache, TestCached, TestResultCache and TestSearches classes
+"""
+
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from api.v1.app import app
+from api.v1.views import cache, places
+import os
+import pep8
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+MemoryCache = cache.MemoryCache
+DirectoryCache = cache.DirectoryCache
+ResultCache = cache.ResultCache
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the caches"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = (inspect.getmembers(MemoryCache, inspect.isfunction) +
+                       inspect.getmembers(DirectoryCache, inspect.isfunction) +
+                       inspect.getmembers(ResultCache, inspect.isfunction))
+
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/views/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test that tests/test_api/test_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_cache_func_docstrings(self):
+        """Test for the presence of docstrings in the cache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestMemoryCache(unittest.TestCase):
+    """Test the MemoryCache class"""
+    def test_get_put(self):
+        """Test that get returns the entry put under a key"""
+        responses = MemoryCache(100)
+        entry = (["State.1"], 200, [("Content-Type", "json")], b"[]")
+        self.assertIsNone(responses.get("a"))
+        responses.put("a", entry)
+        self.assertEqual(responses.get("a"), entry)
+        responses.clear()
+        self.assertIsNone(responses.get("a"))
+
+    def test_eviction(self):
+        """Test that the least recently used entries past size are dropped"""
+        responses = MemoryCache(10)
+        for key in "abc":
+            responses.put(key, ([], 200, [], b"1234"))
+        self.assertIsNone(responses.get("a"))
+        self.assertIsNotNone(responses.get("b"))
+        responses.put("d", ([], 200, [], b"1234"))
+        self.assertIsNone(responses.get("c"))
+        self.assertIsNotNone(responses.get("b"))
+        self.assertIsNotNone(responses.get("d"))
+        responses.put("b", ([], 200, [], b"12345678"))
+        self.assertIsNone(responses.get("d"))
+        self.assertIsNotNone(responses.get("b"))
+
+    def test_eviction_keys(self):
+        """Test that keys count toward the size, as bodies do"""
+        responses = MemoryCache(100)
+        keys = ["POST /places_search {}".format(i) * 2 for i in range(10)]
+        for key in keys:
+            responses.put(key, ([], 200, [], b"[]"))
+        kept = [key for key in keys if responses.get(key) is not None]
+        self.assertEqual(kept, keys[-2:])
+
+
+class TestDirectoryCache(unittest.TestCase):
+    """Test the DirectoryCache class"""
+    def setUp(self):
+        """Creates the directory of the cache"""
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Removes the directory of the cache"""
+        shutil.rmtree(self.path)
+
+    def test_round_trip(self):
+        """Test that an entry put is read back as it was, by any cache
+        of the same directory"""
+        entry = (["State.1", "City.2"], 200,
+                 [("Content-Type", "application/json"), ("Link", "<x>")],
+                 b'[{"id": "1"}]\n')
+        DirectoryCache(self.path, 100).put("GET /states", entry)
+        other = DirectoryCache(self.path, 100)
+        self.assertEqual(other.get("GET /states"), entry)
+        self.assertIsNone(other.get("GET /cities"))
+        other.clear()
+        self.assertIsNone(other.get("GET /states"))
+        self.assertEqual(os.listdir(self.path), [])
+
+    def test_eviction(self):
+        """Test that the least recently used files past size are removed"""
+        responses = DirectoryCache(self.path, 150)
+        for i, key in enumerate("abc"):
+            responses.put(key, ([], 200, [], b"x" * 50))
+            for name in os.listdir(self.path):
+                os.utime(os.path.join(self.path, name), (i, i))
+        self.assertIsNone(responses.get("a"))
+        self.assertIsNotNone(responses.get("b"))
+        self.assertIsNotNone(responses.get("c"))
+        self.assertEqual(len(os.listdir(self.path)), 2)
+
+
+class TestMakeCache(unittest.TestCase):
+    """Test the cache picked from the environment"""
+    def test_make_cache(self):
+        """Test that the directory is only used when tags are global"""
+        path = tempfile.mkdtemp()
+        env = {"HBNB_API_CACHE_MB": "1", "HBNB_API_CACHE_DIR": path}
+        try:
+            with mock.patch.dict(os.environ, env):
+                responses = cache.make_cache()
+            if models.storage_t == "db":
+                self.assertIsInstance(responses, DirectoryCache)
+                self.assertEqual(responses.path, path)
+            else:
+                self.assertIsInstance(responses, MemoryCache)
+            self.assertEqual(responses.size, 2 ** 20)
+            with mock.patch.dict(os.environ, {"HBNB_API_CACHE_MB": "0"}):
+                self.assertIsNone(cache.make_cache())
+        finally:
+            shutil.rmtree(path)
+
+
+class TestCached(unittest.TestCase):
+    """Test that cached views answer from the cache until a change"""
+    def setUp(self):
+        """Swaps in an empty cache and counts the views reaching storage"""
+        self.responses = cache.responses
+        cache.responses = MemoryCache(2 ** 20)
+        self.calls = []
+        all_objects = models.storage.all
+
+        def counted(*args, **kwargs):
+            """counts the calls"""
+            self.calls.append(args)
+            return all_objects(*args, **kwargs)
+        models.storage.all = counted
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Restores the cache and storage"""
+        del models.storage.all
+        cache.responses = self.responses
+
+    def names(self):
+        """returns the names of the states by id, as answered"""
+        response = self.client.get("/api/v1/states")
+        self.assertEqual(response.status_code, 200)
+        return {state["id"]: state["name"] for state in response.get_json()}
+
+    def test_hit(self):
+        """Test that a repeated request is answered from the cache"""
+        first = self.names()
+        self.assertEqual(self.names(), first)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_invalidation(self):
+        """Test that adding, changing and deleting a State invalidates
+        the cached list"""
+        self.names()
+        state = State(name="Cached")
+        models.storage.new(state)
+        models.storage.save()
+        try:
+            self.assertEqual(self.names().get(state.id), "Cached")
+            self.assertEqual(len(self.calls), 2)
+            self.names()
+            self.assertEqual(len(self.calls), 2)
+            state.name = "Renamed"
+            state.save()
+            self.assertEqual(self.names().get(state.id), "Renamed")
+            self.assertEqual(len(self.calls), 3)
+        finally:
+            models.storage.delete(state)
+            models.storage.save()
+        self.assertNotIn(state.id, self.names())
+        self.assertEqual(len(self.calls), 4)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the ResultCache class"""
+    def test_run(self):
+        """Test that a result is computed again only when its tags change"""
+        results = ResultCache(4)
+        calls = []
+
+        def compute():
+            """returns the number of calls"""
+            calls.append(None)
+            return len(calls)
+        self.assertEqual(results.run("a", ["1"], compute), 1)
+        self.assertEqual(results.run("a", ("1",), compute), 1)
+        self.assertEqual(results.run("a", ["2"], compute), 2)
+        self.assertEqual(results.run("a", ["2"], compute), 2)
+        results.clear()
+        self.assertEqual(results.run("a", ["2"], compute), 3)
+
+    def test_eviction(self):
+        """Test that the least recently used results past size are dropped"""
+        results = ResultCache(2)
+        for key in "abc":
+            results.run(key, [], lambda: key)
+        self.assertEqual(results.run("a", [], lambda: "new"), "new")
+        self.assertEqual(results.run("c", [], lambda: "new"), "c")
+        self.assertEqual(results.run("b", [], lambda: "new"), "new")
+        self.assertEqual(results.run("a", [], lambda: "newer"), "newer")
+        self.assertEqual(ResultCache(0).run("a", [], lambda: "a"), "a")
+
+    def coalesce(self, fail):
+        """
+        runs 4 threads asking for the same result while the first computes
+        it, failing if fail; returns the calls to compute and the results
+        """
+        results = ResultCache(0)
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        answers = []
+
+        def compute():
+            """returns the ids found, once released if first"""
+            calls.append(None)
+            if len(calls) == 1:
+                started.set()
+                release.wait()
+                if fail:
+                    raise ValueError("search failed")
+            return ("1", "2")
+
+        def ask():
+            """keeps the result, or the error raised"""
+            try:
+                answers.append(results.run("a", ["1"], compute))
+            except ValueError as error:
+                answers.append(error)
+        threads = [threading.Thread(target=ask) for i in range(4)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return calls, answers
+
+    def test_coalescing(self):
+        """Test that threads asking during a computation share its result"""
+        calls, answers = self.coalesce(False)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(answers, [("1", "2")] * 4)
+
+    def test_coalescing_failure(self):
+        """Test that the threads waiting on a failed computation compute
+        the result themselves"""
+        calls, answers = self.coalesce(True)
+        self.assertEqual(len(calls), 4)
+        errors = [a for a in answers if isinstance(a, ValueError)]
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(answers.count(("1", "2")), 3)
+
+
+class TestSearches(unittest.TestCase):
+    """Test that places_search reuses the ids found until a change"""
+    def setUp(self):
+        """Saves a place, swaps in empty caches and counts the searches"""
+        self.responses, self.searches = cache.responses, places.searches
+        cache.responses, places.searches = None, ResultCache(16)
+        self.state = State(name="Searched")
+        self.city = City(name="Searched", state_id=self.state.id)
+        self.user = User(email="search@hbnb.io", password="pwd")
+        self.place = Place(name="Searched", city_id=self.city.id,
+                           user_id=self.user.id)
+        self.saved = [self.place, self.city, self.user, self.state]
+        for obj in reversed(self.saved):
+            models.storage.new(obj)
+        models.storage.save()
+        self.calls = []
+        search = models.storage.search
+
+        def counted(*args, **kwargs):
+            """counts the calls"""
+            self.calls.append(args)
+            return search(*args, **kwargs)
+        models.storage.search = counted
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Deletes the objects saved, restores the caches and storage"""
+        del models.storage.search
+        for obj in self.saved:
+            models.storage.delete(obj)
+        models.storage.save()
+        cache.responses, places.searches = self.responses, self.searches
+
+    def ids(self):
+        """returns the ids of the places found in the state, as answered"""
+        response = self.client.post("/api/v1/places_search",
+                                    json={"states": [self.state.id],
+                                          "limit": 10})
+        self.assertEqual(response.status_code, 200)
+        return [place["id"] for place in response.get_json()]
+
+    def test_invalidation(self):
+        """Test that the ids found are reused until a State, a Place or an
+        Amenity is added, changed or deleted"""
+        self.assertEqual(self.ids(), [self.place.id])
+        self.assertEqual(self.ids(), [self.place.id])
+        self.assertEqual(len(self.calls), 1)
+        other = Place(name="Other", city_id=self.city.id,
+                      user_id=self.user.id)
+        models.storage.new(other)
+        models.storage.save()
+        self.saved.insert(0, other)
+        self.assertEqual(sorted(self.ids()),
+                         sorted([self.place.id, other.id]))
+        self.assertEqual(len(self.calls), 2)
+        amenity = Amenity(name="Searched")
+        models.storage.new(amenity)
+        models.storage.save()
+        self.saved.insert(0, amenity)
+        self.ids()
+        self.assertEqual(len(self.calls), 3)
+        models.storage.delete(other)
+        models.storage.save()
+        self.saved.remove(other)
+        self.assertEqual(self.ids(), [self.place.id])
+        self.assertEqual(len(self.calls), 4)
+        self.state.name = "Renamed"
+        self.state.save()
+        self.assertEqual(self.ids(), [self.place.id])
+        self.assertEqual(len(self.calls), 5)
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditionalDocs and TestConditional classes
+"""
+
+from datetime import datetime, timedelta, timezone
+import importlib
+import inspect
+import models
+from models.state import State
+from api.v1.app import app
+import pep8
+import unittest
+from unittest import mock
+from werkzeug.http import http_date
+# the module, not the decorator of the same name api.v1.views holds
+conditional = importlib.import_module("api.v1.views.conditional")
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of conditional.py"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.conditional_f = inspect.getmembers(conditional,
+                                               inspect.isfunction)
+
+    def test_pep8_conformance_conditional(self):
+        """Test that api/v1/views/conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_conditional(self):
+        """Test that tests/test_api/test_conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_conditional_func_docstrings(self):
+        """Test for the presence of docstrings in the conditional functions"""
+        for func in self.conditional_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+
+
+class TestConditional(unittest.TestCase):
+    """Test the Last-Modified and If-Modified-Since of the GET views"""
+    def setUp(self):
+        """Saves a state and reads the time of that change"""
+        self.state = State(name="Modified")
+        models.storage.new(self.state)
+        models.storage.save()
+        self.changed = models.storage.version(State)[1]
+        self.second = self.changed.replace(microsecond=0)
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Deletes the state saved"""
+        models.storage.delete(self.state)
+        models.storage.save()
+
+    def get(self, now, since=None):
+        """returns the answer to GET /states at the time now"""
+        headers = {}
+        if since is not None:
+            headers["If-Modified-Since"] = http_date(since)
+        clock = mock.Mock(wraps=datetime)
+        clock.utcnow.return_value = now
+        with mock.patch.object(conditional, "datetime", clock):
+            return self.client.get("/api/v1/states", headers=headers)
+
+    def test_current_second(self):
+        """Test that no Last-Modified is sent, nor matched, until the second
+        of the last change is over"""
+        now = self.second + timedelta(microseconds=999999)
+        response = self.get(now)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.last_modified)
+        self.assertIsNotNone(response.get_etag()[0])
+        self.assertEqual(self.get(now, self.second).status_code, 200)
+
+    def test_past_second(self):
+        """Test that Last-Modified is sent, and matched, once the second of
+        the last change is over"""
+        now = self.second + timedelta(seconds=1)
+        response = self.get(now)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.last_modified,
+                         self.second.replace(tzinfo=timezone.utc))
+        self.assertEqual(self.get(now, self.second).status_code, 304)
+        earlier = self.second - timedelta(seconds=1)
+        self.assertEqual(self.get(now, earlier).status_code, 200)
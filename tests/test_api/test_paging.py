@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Contains the TestPagingDocs and TestCursor classes
+"""
+
+import base64
+from datetime import datetime
+import inspect
+import json
+from api.v1.views import paging
+import pep8
+import unittest
+from werkzeug.exceptions import BadRequest
+
+
+def cursor(data):
+    """returns the cursor holding data"""
+    encoded = base64.urlsafe_b64encode(json.dumps(data).encode())
+    return encoded.decode().rstrip("=")
+
+
+class TestPagingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of paging.py"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.paging_f = inspect.getmembers(paging, inspect.isfunction)
+
+    def test_pep8_conformance_paging(self):
+        """Test that api/v1/views/paging.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/paging.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_paging(self):
+        """Test that tests/test_api/test_paging.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_paging.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_paging_func_docstrings(self):
+        """Test for the presence of docstrings in the paging functions"""
+        for func in self.paging_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+
+
+class TestCursor(unittest.TestCase):
+    """Test the decoding of cursors"""
+    def test_decode(self):
+        """Test that a cursor gives back its order and (value, id)"""
+        self.assertEqual(paging.decode_cursor(cursor(["id", "a", "a"])),
+                         ("id", ("a", "a")))
+        self.assertEqual(
+            paging.decode_cursor(cursor(["-price_by_night", 3, "a"])),
+            ("-price_by_night", (3, "a")))
+        self.assertEqual(paging.decode_cursor(cursor(["name", None, "a"])),
+                         ("name", (None, "a")))
+        self.assertEqual(paging.decode_cursor(
+            cursor(["created_at", "2017-06-14T22:31:03.285259", "a"])),
+            ("created_at", (datetime(2017, 6, 14, 22, 31, 3, 285259), "a")))
+
+    def test_invalid(self):
+        """Test that cursors of the wrong shape or types are refused"""
+        for data in ["x", ["id", "a"], ["id", 1, "a"], ["id", "a", 2],
+                     ["name", 5, "a"], ["price_by_night", "5", "a"],
+                     ["max_guest", True, "a"], ["created_at", 5, "a"],
+                     ["latitude", 1.5, "a"], [1, "a", "a"]]:
+            with self.subTest(data=data):
+                with self.assertRaises(BadRequest):
+                    paging.decode_cursor(cursor(data))
+        with self.assertRaises(BadRequest):
+            paging.decode_cursor("not a cursor")
@@ -7,7 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models import amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attributes, compact
 import pep8
 import unittest
 Amenity = amenity.Amenity
@@ -83,7 +83,8 @@ class TestAmenity(unittest.TestCase):
         new_d = am.to_dict()
         self.assertEqual(type(new_d), dict)
         self.assertFalse("_sa_instance_state" in new_d)
-        for attr in am.__dict__:
+        attrs = attributes(am) if compact else am.__dict__
+        for attr in attrs:
             if attr is not "_sa_instance_state":
                 self.assertTrue(attr in new_d)
         self.assertTrue("__class__" in new_d)
@@ -102,5 +103,6 @@ class TestAmenity(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         amenity = Amenity()
-        string = "[Amenity] ({}) {}".format(amenity.id, amenity.__dict__)
+        attrs = attributes(amenity) if compact else amenity.__dict__
+        string = "[Amenity] ({}) {}".format(amenity.id, attrs)
         self.assertEqual(string, str(amenity))
@@ -3,11 +3,16 @@
 from datetime import datetime
 import inspect
 import models
+import os
 import pep8 as pycodestyle
+import subprocess
+import sys
 import time
 import unittest
 from unittest import mock
 BaseModel = models.base_model.BaseModel
+attributes = models.base_model.attributes
+compact = models.base_model.compact
 module_doc = models.base_model.__doc__
 
 
@@ -73,8 +78,8 @@ class TestBaseModel(unittest.TestCase):
         }
         for attr, typ in attrs_types.items():
             with self.subTest(attr=attr, typ=typ):
-                self.assertIn(attr, inst.__dict__)
-                self.assertIs(type(inst.__dict__[attr]), typ)
+                self.assertTrue(hasattr(inst, attr))
+                self.assertIs(type(getattr(inst, attr)), typ)
         self.assertEqual(inst.name, "Holberton")
         self.assertEqual(inst.number, 89)
 
@@ -127,6 +132,17 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(d['name'], "Holberton")
         self.assertEqual(d['my_number'], 89)
 
+    def test_to_dict_fields(self):
+        """Test that to_dict keeps only the id and the fields asked for"""
+        my_model = BaseModel()
+        my_model.name = "Holberton"
+        my_model.password = "pwd"
+        d = my_model.to_dict(fields=["name", "updated_at", "password", "x"])
+        self.assertEqual(d, {"id": my_model.id, "name": "Holberton",
+                             "updated_at": my_model.to_dict()["updated_at"]})
+        d = my_model.to_dict(fields=["__class__"])
+        self.assertEqual(d, {"id": my_model.id, "__class__": "BaseModel"})
+
     def test_to_dict_values(self):
         """test that values in dict returned from to_dict are correct"""
         t_format = "%Y-%m-%dT%H:%M:%S.%f"
@@ -141,7 +157,8 @@ class TestBaseModel(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
-        string = "[BaseModel] ({}) {}".format(inst.id, inst.__dict__)
+        attrs = attributes(inst) if compact else inst.__dict__
+        string = "[BaseModel] ({}) {}".format(inst.id, attrs)
         self.assertEqual(string, str(inst))
 
     @mock.patch('models.storage')
@@ -158,3 +175,37 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    def test_time_codec(self):
+        """Test that parse_time and format_time match strptime/strftime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for value in [datetime(2017, 6, 14, 22, 31, 3, 285259),
+                      datetime(2017, 6, 14, 22, 31, 3)]:
+            with self.subTest(value=value):
+                text = models.base_model.format_time(value)
+                self.assertEqual(text, value.strftime(t_format))
+                self.assertEqual(models.base_model.parse_time(text),
+                                 datetime.strptime(text, t_format))
+        old = datetime(999, 1, 2, 3, 4, 5, 6)
+        self.assertEqual(models.base_model.format_time(old),
+                         old.strftime(t_format))
+        self.assertEqual(models.base_model.parse_time("2017-06-14T22:31:3.1"),
+                         datetime(2017, 6, 14, 22, 31, 3, 100000))
+
+    @unittest.skipIf(models.storage_t in ('db', 'mmap'),
+                     "not testing file storage")
+    def test_compact(self):
+        """Test that compact models keep their attributes in slots"""
+        code = "\n".join([
+            "from models.place import Place",
+            "p = Place(name='Casa', extra=1)",
+            "p.other = 'x'",
+            "assert not hasattr(p, '__dict__')",
+            "assert p.number_rooms == 0 and p.other == 'x'",
+            "d = p.to_dict()",
+            "assert d['name'] == 'Casa' and d['extra'] == 1",
+            "assert d['other'] == 'x' and 'number_rooms' not in d",
+            "assert str(p).startswith('[Place] ({}) '.format(p.id))",
+            "assert \"'other': 'x'\" in str(p)"])
+        env = dict(os.environ, HBNB_COMPACT_MODELS="1")
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
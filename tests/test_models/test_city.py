@@ -7,7 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models import city
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attributes, compact
 import pep8
 import unittest
 City = city.City
@@ -91,7 +91,8 @@ class TestCity(unittest.TestCase):
         new_d = c.to_dict()
         self.assertEqual(type(new_d), dict)
         self.assertFalse("_sa_instance_state" in new_d)
-        for attr in c.__dict__:
+        attrs = attributes(c) if compact else c.__dict__
+        for attr in attrs:
             if attr is not "_sa_instance_state":
                 self.assertTrue(attr in new_d)
         self.assertTrue("__class__" in new_d)
@@ -110,5 +111,6 @@ class TestCity(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         city = City()
-        string = "[City] ({}) {}".format(city.id, city.__dict__)
+        attrs = attributes(city) if compact else city.__dict__
+        string = "[City] ({}) {}".format(city.id, attrs)
         self.assertEqual(string, str(city))
@@ -3,6 +3,7 @@
 Contains the TestDBStorageDocs and TestDBStorage classes
 """
 
+from contextlib import contextmanager
 from datetime import datetime
 import inspect
 import models
@@ -17,7 +18,9 @@ from models.user import User
 import json
 import os
 import pep8
+from sqlalchemy import event
 import unittest
+from unittest import mock
 from models import storage
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
@@ -71,6 +74,23 @@ test_db_storage.py'])
 
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    @contextmanager
+    def recording_selects(self):
+        """yields the list of the SELECT statements run on the engine
+        within the block"""
+        engine = storage._DBStorage__engine
+        selects = []
+
+        def record(conn, cursor, statement, params, context, many):
+            """keeps the SELECT statements run on the engine"""
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(statement)
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield selects
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_all_returns_dict(self):
         """Test that all returns a dictionaty"""
@@ -97,6 +117,175 @@ class TestFileStorage(unittest.TestCase):
         get_instance = storage.get(State, instance.id)
         self.assertEqual(get_instance, instance)
 
+    def test_pool_options(self):
+        """Test that the pool settings are read from the environment"""
+        dbs = db_storage.DBStorage.__new__(db_storage.DBStorage)
+        env = {"HBNB_MYSQL_POOL_SIZE": "20",
+               "HBNB_MYSQL_POOL_MAX_OVERFLOW": "0",
+               "HBNB_MYSQL_POOL_TIMEOUT": "2.5",
+               "HBNB_MYSQL_POOL_RECYCLE": "600",
+               "HBNB_MYSQL_POOL_PRE_PING": "0"}
+        with mock.patch.dict(os.environ, env):
+            self.assertEqual(dbs.pool_options(),
+                             {"pool_size": 20, "max_overflow": 0,
+                              "pool_timeout": 2.5, "pool_recycle": 600,
+                              "pool_pre_ping": False})
+        with mock.patch.dict(os.environ):
+            for name in env:
+                os.environ.pop(name, None)
+            self.assertTrue(dbs.pool_options()["pool_pre_ping"])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that pool_stats counts the connection checkouts"""
+        before = storage.pool_stats()
+        storage.close()
+        storage.count(State)
+        after = storage.pool_stats()
+        self.assertGreater(after["checkouts"], before["checkouts"])
+        self.assertGreaterEqual(after["checkins"], before["checkins"])
+        self.assertGreaterEqual(after["peak_checkedout"], 1)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_eager(self):
+        """Test that eager loads a relationship tree in fixed queries"""
+        ids = []
+        for i in range(3):
+            state = State(name="State {}".format(i))
+            storage.new(state)
+            ids.append(state.id)
+            for j in range(2):
+                storage.new(City(name="City {}".format(j), state_id=state.id))
+        storage.save()
+        for strategy, expected in [("selectin", 2), ("joined", 1)]:
+            storage.close()
+            with self.recording_selects() as selects:
+                states = storage.eager(State, "cities", ids=ids,
+                                       strategy=strategy)
+                names = sorted(c.name for s in states.values()
+                               for c in s.cities)
+            with self.subTest(strategy=strategy):
+                self.assertEqual(len(states), 3)
+                self.assertEqual(names, sorted(["City 0", "City 1"] * 3))
+                self.assertEqual(len(selects), expected)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search(self):
+        """Test that search filters places in a single SELECT"""
+        user = User(email="search@hbnb.io", password="pwd")
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        state, other = State(name="Caldas"), State(name="Huila")
+        cities = [City(name="Manizales", state_id=state.id),
+                  City(name="Neiva", state_id=other.id),
+                  City(name="Pitalito", state_id=other.id)]
+        places = [Place(name=str(i), city_id=city.id, user_id=user.id)
+                  for i, city in enumerate(cities)]
+        places[0].amenities.extend([wifi, pool])
+        places[1].amenities.append(wifi)
+        for obj in [user, wifi, pool, state, other] + cities + places:
+            storage.new(obj)
+        storage.save()
+        storage.close()
+        with self.recording_selects() as selects:
+            results = [
+                storage.search(states=[state.id]),
+                storage.search(states=[state.id], cities=[cities[2].id]),
+                storage.search(states=[other.id], amenities=[wifi.id]),
+                storage.search(amenities=[wifi.id, pool.id, wifi.id]),
+                storage.search(cities=[cities[1].id], amenities=["x"])]
+        names = [sorted(p.name for p in result) for result in results]
+        self.assertEqual(names, [["0"], ["0", "2"], ["1"], ["0"], []])
+        self.assertEqual(len(selects), len(results))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search_page(self):
+        """Test that search returns pages in order past a keyset cursor"""
+        user = User(email="page@hbnb.io", password="pwd")
+        state = State(name="Boyaca")
+        city = City(name="Tunja", state_id=state.id)
+        places = [Place(name=str(i), price_by_night=i % 3, city_id=city.id,
+                        user_id=user.id) for i in range(7)]
+        for obj in [user, state, city] + places:
+            storage.new(obj)
+        storage.save()
+        by_price = sorted(places, key=lambda p: (p.price_by_night, p.id))
+        found = storage.search(states=[state.id], limit=3,
+                               order_by="price_by_night")
+        self.assertEqual([p.id for p in found], [p.id for p in by_price[:3]])
+        last = found[-1]
+        found = storage.search(states=[state.id], limit=3,
+                               order_by="-price_by_night",
+                               after=(last.price_by_night, last.id))
+        self.assertEqual([p.id for p in found],
+                         [p.id for p in by_price[1::-1]])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_page(self):
+        """Test that all and related return pages of objects by id"""
+        state = State(name="Meta")
+        cities = [City(name=str(i), state_id=state.id) for i in range(5)]
+        for obj in [state] + cities:
+            storage.new(obj)
+        storage.save()
+        ids = sorted(c.id for c in cities)
+        found = storage.related(City, "state_id", state.id, limit=2,
+                                after=(ids[0], ids[0]))
+        self.assertEqual([obj.id for obj in found], ids[1:3])
+        found = storage.all(City, after=(ids[2], ids[2]))
+        self.assertEqual([obj.id for obj in found.values()
+                          if obj.state_id == state.id], ids[3:])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_fields(self):
+        """Test that fields narrows the columns selected to those asked"""
+        state = State(name="Narino")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        with self.recording_selects() as selects:
+            obj = storage.get(State, state.id, ["name"])
+            found = storage.all(State, fields=["name"])
+        self.assertEqual(obj.to_dict(fields=["name"]),
+                         {"id": state.id, "name": "Narino"})
+        self.assertIn("State." + state.id, found)
+        for statement in selects:
+            self.assertNotIn("created_at", statement.split("FROM")[0])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version(self):
+        """Test that versions change in the transactions changing objects"""
+        state = State(name="Choco")
+        city = City(name="Quibdo", state_id=state.id)
+        tags = [storage.version(State)[0], storage.version(City)[0]]
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        self.assertNotEqual(storage.version(State)[0], tags[0])
+        tags = [storage.version(State)[0], storage.version(City)[0]]
+        storage.delete(state)
+        storage.save()
+        self.assertNotEqual(storage.version(State)[0], tags[0])
+        self.assertNotEqual(storage.version(City)[0], tags[1])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_primary_key(self):
+        """Test that get runs one SELECT by primary key, then none"""
+        instance = State(name="Antioquia")
+        storage.new(instance)
+        storage.new(State(name="Valle"))
+        storage.save()
+        storage.close()
+        with self.recording_selects() as selects:
+            first = storage.get(State, instance.id)
+            second = storage.get(State, instance.id)
+            missing = storage.get(State, "missing")
+        self.assertEqual(first.id, instance.id)
+        self.assertIs(second, first)
+        self.assertIsNone(missing)
+        self.assertEqual(len(selects), 2)
+        for statement in selects:
+            self.assertRegex(statement, r"WHERE states\.id = ")
+
     def test_count(self):
         """ Tests count method db storage """
         dic = {"name": "Vecindad"}
@@ -6,7 +6,7 @@ Contains the TestFileStorageDocs classes
 from datetime import datetime
 import inspect
 import models
-from models.engine import file_storage
+from models.engine import columnar, file_storage
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,12 +17,24 @@ from models.user import User
 import json
 import os
 import pep8
+import threading
 import unittest
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+def snapshot():
+    """returns the records of the snapshot file by key, as JSON holds them"""
+    path = FileStorage._FileStorage__file_path
+    if FileStorage._FileStorage__format == "columnar":
+        with open(path, "rb") as f:
+            return {key: columnar.to_json(value)
+                    for key, value in columnar.load(f)}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
 class TestFileStorageDocs(unittest.TestCase):
     """Tests to check the documentation and style of FileStorage class"""
     @classmethod
@@ -110,9 +122,7 @@ class TestFileStorage(unittest.TestCase):
         for key, value in new_dict.items():
             new_dict[key] = value.to_dict()
         string = json.dumps(new_dict)
-        with open("file.json", "r") as f:
-            js = f.read()
-        self.assertEqual(json.loads(string), json.loads(js))
+        self.assertEqual(json.loads(string), snapshot())
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_get(self):
@@ -139,3 +149,486 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all(cls) only returns the objects of that class"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        city = City(name="Mexico")
+        storage.new(state)
+        storage.new(city)
+        states = storage.all(State)
+        self.assertIn("State." + state.id, states)
+        self.assertNotIn("City." + city.id, states)
+        self.assertEqual(storage.all("State"), states)
+        storage.delete(state)
+        storage.delete(city)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_after_delete(self):
+        """Test that get returns None once an object is deleted"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        storage.new(state)
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertIsNone(storage.get(City, state.id))
+        storage.delete(state)
+        self.assertIsNone(storage.get(State, state.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_cls(self):
+        """Test that count(cls) follows new and delete"""
+        storage = FileStorage()
+        before = storage.count(State)
+        state = State(name="Vecindad")
+        storage.new(state)
+        self.assertEqual(storage.count(State), before + 1)
+        self.assertEqual(storage.count("State"), before + 1)
+        self.assertEqual(storage.count(State), len(storage.all(State)))
+        storage.delete(state)
+        self.assertEqual(storage.count(State), before)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_eager(self):
+        """Test that eager returns the objects of a class, or some of them"""
+        storage = FileStorage()
+        state = State(name="Bolivar")
+        storage.new(state)
+        self.assertEqual(storage.eager(State, "cities"), storage.all(State))
+        self.assertEqual(storage.eager("State", "cities",
+                                       ids=[state.id, "missing"]),
+                         {"State." + state.id: state})
+        storage.delete(state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search(self):
+        """Test that search filters places by state, city and amenities"""
+        storage = FileStorage()
+        state, other = State(name="Caldas"), State(name="Huila")
+        cities = [City(name="Manizales", state_id=state.id),
+                  City(name="Neiva", state_id=other.id),
+                  City(name="Pitalito", state_id=other.id)]
+        places = [Place(name=str(i), city_id=city.id)
+                  for i, city in enumerate(cities)]
+        places[0].amenity_ids = ["wifi", "pool"]
+        places[1].amenity_ids = ["wifi", "x"]
+        amenities = [Amenity(id="wifi"), Amenity(id="pool")]
+        objs = [state, other] + cities + places + amenities
+        for obj in objs:
+            storage.new(obj)
+        results = [
+            storage.search(states=[state.id]),
+            storage.search(states=[state.id], cities=[cities[2].id]),
+            storage.search(states=[other.id], amenities=["wifi"]),
+            storage.search(amenities=["wifi", "pool", "wifi"]),
+            storage.search(cities=[cities[1].id], amenities=["x"])]
+        names = [sorted(p.name for p in result) for result in results]
+        self.assertEqual(names, [["0"], ["0", "2"], ["1"], ["0"], []])
+        found = storage.search(states=[other.id, state.id, other.id],
+                               cities=[cities[0].id, cities[2].id])
+        self.assertEqual([p.name for p in found], ["1", "2", "0"])
+        for obj in objs:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t in ('db', 'mmap'),
+                     "not testing file storage")
+    def test_version_after_set(self):
+        """Test that the version changes once the value is set, not before"""
+        storage = FileStorage()
+        state = State(name="Tolima")
+        storage.new(state)
+        before = storage.version(State)[0]
+        seen = []
+        touch = FileStorage.touch
+
+        def watched(self, obj, name, value):
+            """keeps the version read while the old value is set"""
+            touch(self, obj, name, value)
+            seen.append((storage.version(State)[0], obj.name))
+        FileStorage.touch = watched
+        try:
+            state.name = "Ibague"
+        finally:
+            FileStorage.touch = touch
+        self.assertEqual(seen, [(before, "Tolima")])
+        self.assertNotEqual(storage.version(State)[0], before)
+        storage.delete(state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_deleted_parents(self):
+        """Test that the ids of deleted states and cities are skipped"""
+        storage = FileStorage()
+        state = State(name="Cesar")
+        cities = [City(name="Valledupar", state_id=state.id),
+                  City(name="Aguachica", state_id=state.id)]
+        places = [Place(name=str(i), city_id=city.id)
+                  for i, city in enumerate(cities)]
+        for obj in [state] + cities + places:
+            storage.new(obj)
+        storage.delete(cities[0])
+        self.assertEqual(storage.search(cities=[cities[0].id]), [])
+        self.assertEqual(storage.search(cities=[c.id for c in cities]),
+                         [places[1]])
+        self.assertEqual(storage.search(states=[state.id]), [places[1]])
+        storage.delete(state)
+        self.assertEqual(storage.search(states=[state.id]), [])
+        self.assertEqual(storage.search(states=[state.id],
+                                        cities=[cities[1].id]), [places[1]])
+        for obj in [cities[1]] + places:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_page(self):
+        """Test that search returns pages in order past a keyset cursor"""
+        storage = FileStorage()
+        places = [Place(name=str(i), price_by_night=i % 3, city_id="page",
+                        amenity_ids=["page"]) for i in range(7)]
+        amenity, city = Amenity(id="page"), City(id="page")
+        storage.new(amenity)
+        storage.new(city)
+        for place in places:
+            storage.new(place)
+        by_price = sorted(places, key=lambda p: (p.price_by_night, p.id))
+        for where in [{"cities": ["page"]}, {"amenities": ["page"]}]:
+            found = storage.search(limit=3, order_by="price_by_night",
+                                   **where)
+            self.assertEqual(found, by_price[:3])
+            last = found[-1]
+            storage.new(Place(id="0", price_by_night=0, city_id="page",
+                              amenity_ids=["page"]))
+            found = storage.search(limit=3, order_by="price_by_night",
+                                   after=(last.price_by_night, last.id),
+                                   **where)
+            self.assertEqual(found, by_price[3:6])
+            storage.delete(storage.get(Place, "0"))
+            found = storage.search(order_by="-id", after=(last.id, last.id),
+                                   **where)
+            self.assertEqual(found, sorted([p for p in places
+                                            if p.id < last.id],
+                                           key=lambda p: p.id, reverse=True))
+        for place in places + [amenity, city]:
+            storage.delete(place)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_page(self):
+        """Test that all and related return pages of objects by id"""
+        storage = FileStorage()
+        state = State(name="Meta")
+        # ids sorting before those of the other objects of the storage
+        ids = ["!page-{}".format(i) for i in range(5)]
+        cities = [City(id=id, state_id=state.id) for id in ids]
+        for obj in [state] + cities:
+            storage.new(obj)
+        found = storage.all(City, limit=2)
+        self.assertEqual(list(found), ["City." + id for id in ids[:2]])
+        storage.delete(cities[2])
+        extra = City(id="!page-10", state_id=state.id)
+        storage.new(extra)
+        found = storage.all(City, after=(ids[1], ids[1]), limit=3)
+        self.assertEqual([obj.id for obj in found.values()],
+                         [extra.id] + ids[3:])
+        found = storage.related(City, "state_id", state.id, limit=2,
+                                after=(ids[0], ids[0]))
+        self.assertEqual([obj.id for obj in found], [ids[1], extra.id])
+        for obj in [state, extra] + cities:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t in ('db', 'mmap'),
+                     "not testing file storage")
+    def test_version(self):
+        """Test that the version of a class changes with its objects"""
+        storage = FileStorage()
+        state = State(name="Cauca")
+        tag, modified = storage.version(State)
+        self.assertEqual(storage.version("State"), (tag, modified))
+        storage.new(state)
+        versions = [storage.version(State)[0]]
+        state.name = "Valle"
+        versions.append(storage.version(State)[0])
+        other = storage.version(City)
+        storage.delete(state)
+        versions.append(storage.version(State)[0])
+        self.assertEqual(len({tag, *versions}), 4)
+        self.assertEqual(storage.version(City), other)
+        self.assertGreaterEqual(storage.version(State)[1], modified)
+
+    @unittest.skipIf(models.storage_t in ('db', 'mmap'),
+                     "not testing file storage")
+    def test_amenity_index(self):
+        """Test that places are indexed by amenity as amenity_ids changes"""
+        storage = FileStorage()
+        place = Place(name="Loft", amenity_ids=["wifi", "pool"])
+        other = Place(name="Cabin", amenity_ids=["wifi"])
+        amenities = [Amenity(id="wifi"), Amenity(id="pool")]
+        for obj in [place, other] + amenities:
+            storage.new(obj)
+        self.assertCountEqual(storage.search(amenities=["wifi"]),
+                              [place, other])
+        self.assertEqual(storage.search(amenities=["wifi", "pool"]), [place])
+        place.amenity_ids = [a for a in place.amenity_ids if a != "pool"]
+        other.amenity_ids = other.amenity_ids + ["pool"]
+        self.assertEqual(storage.search(amenities=["pool"]), [other])
+        storage.save()
+        FileStorage._FileStorage__file_stat = None
+        storage.reload()
+        found = storage.search(amenities=["pool", "wifi"])
+        self.assertEqual([p.id for p in found], [other.id])
+        storage.delete(storage.get(Place, other.id))
+        self.assertEqual(storage.search(amenities=["pool"]), [])
+        storage.delete(storage.get(Place, place.id))
+        for amenity in amenities:
+            storage.delete(storage.get(Amenity, amenity.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t in ('db', 'mmap'),
+                     "not testing file storage")
+    def test_search_deleted_amenity(self):
+        """Test that a deleted amenity matches no place until it is back"""
+        storage = FileStorage()
+        amenity, city = Amenity(id="sauna"), City(id="sauna")
+        place = Place(name="Spa", city_id="sauna", amenity_ids=["sauna"])
+        for obj in [amenity, city, place]:
+            storage.new(obj)
+        for where in [{}, {"cities": ["sauna"]}]:
+            self.assertEqual(storage.search(amenities=["sauna"], **where),
+                             [place])
+        storage.delete(amenity)
+        for where in [{}, {"cities": ["sauna"]}]:
+            self.assertEqual(storage.search(amenities=["sauna"], **where),
+                             [])
+        storage.new(Amenity(id="sauna"))
+        self.assertEqual(storage.search(amenities=["sauna"]), [place])
+        storage.delete(place)
+        storage.delete(city)
+        storage.delete(storage.get(Amenity, "sauna"))
+
+    @unittest.skipIf(models.storage_t in ('db', 'mmap'),
+                     "not testing file storage")
+    def test_amenity_index_saved_twice(self):
+        """Test that a place stored again keeps a single row"""
+        storage = FileStorage()
+        amenity = Amenity(id="jacuzzi")
+        place = Place(name="Loft", amenity_ids=["jacuzzi"])
+        storage.new(amenity)
+        place.save()
+        place.save()
+        self.assertEqual(storage.search(amenities=["jacuzzi"]), [place])
+        self.assertEqual(storage.search(amenities=["jacuzzi"], limit=5),
+                         [place])
+        place.delete()
+        self.assertEqual(storage.search(amenities=["jacuzzi"]), [])
+        storage.delete(amenity)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t in ('db', 'mmap'),
+                     "not testing file storage")
+    def test_amenity_index_in_place(self):
+        """Test that amenity_ids changed in place leave no stale bits"""
+        storage = FileStorage()
+        place = Place(name="Loft", amenity_ids=["wifi", "pool"])
+        amenities = [Amenity(id="wifi"), Amenity(id="pool")]
+        for obj in [place] + amenities:
+            storage.new(obj)
+        place.amenity_ids.remove("wifi")
+        self.assertEqual(storage.search(amenities=["wifi"]), [])
+        self.assertEqual(storage.search(amenities=["pool"]), [place])
+        storage.delete(place)
+        self.assertEqual(storage.search(amenities=["wifi"]), [])
+        other = Place(name="Cabin")
+        storage.new(other)
+        self.assertEqual(storage.search(amenities=["wifi"]), [])
+        self.assertEqual(storage.search(amenities=["pool"]), [])
+        for obj in [other] + amenities:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related(self):
+        """Test that related follows new, attribute changes and delete"""
+        storage = models.storage
+        state = State(name="Vecindad")
+        other = State(name="Mexico")
+        city = City(name="Chapultepec", state_id=state.id)
+        place = Place(name="Casa", city_id=city.id)
+        for obj in [state, other, city, place]:
+            storage.new(obj)
+        self.assertEqual(state.cities, [city])
+        self.assertEqual(city.places, [place])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        storage.delete(city)
+        self.assertEqual(other.cities, [])
+        for obj in [state, other, place]:
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal(self):
+        """Test that journal mode appends changes and replays them"""
+        storage = FileStorage()
+        journal = FileStorage._FileStorage__journal_path
+        FileStorage._FileStorage__journal = True
+        try:
+            state = State(name="Vecindad")
+            key = "State." + state.id
+            storage.new(state)
+            storage.save()
+            with open(journal, "r") as f:
+                record = json.loads(f.readlines()[-1])
+            self.assertEqual(record, {key: state.to_dict(save_fs=1)})
+            object.__setattr__(state, "name", "Mexico")
+            FileStorage._FileStorage__journal_pos = (None, 0)
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name, "Vecindad")
+            storage.delete(storage.get(State, state.id))
+            storage.save()
+            with open(journal, "r") as f:
+                record = json.loads(f.readlines()[-1])
+            self.assertEqual(record, {key: None})
+        finally:
+            FileStorage._FileStorage__journal = False
+            storage.compact()
+        self.assertFalse(os.path.exists(journal))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_batched(self):
+        """Test that saves within the fsync window share one write and
+        each returns once its changes are written"""
+        storage = FileStorage()
+        storage.compact()
+        compact = FileStorage.compact
+        written = []
+        states = [State(name="Vecindad {}".format(i)) for i in range(4)]
+        found = []
+
+        def counted(self):
+            """counts the writes"""
+            written.append(len(FileStorage._FileStorage__changed))
+            compact(self)
+
+        def save(state):
+            """saves state, then looks for it in the file"""
+            storage.new(state)
+            storage.save()
+            found.append("State." + state.id in snapshot())
+        FileStorage.compact = counted
+        FileStorage._FileStorage__fsync_window = 0.2
+        try:
+            threads = [threading.Thread(target=save, args=(state,))
+                       for state in states]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(found, [True] * 4)
+            self.assertEqual(written, [4])
+            self.assertIsNone(FileStorage._FileStorage__timer)
+        finally:
+            FileStorage.compact = compact
+            FileStorage._FileStorage__fsync_window = 0
+            for state in states:
+                storage.delete(state)
+            storage.save()
+        tmp = [name for name in os.listdir(".") if name.endswith(".tmp")]
+        self.assertEqual(tmp, [])
+
+    @unittest.skipIf(models.storage_t in ('db', 'mmap'),
+                     "not testing file storage")
+    @unittest.skipIf(FileStorage._FileStorage__format == "columnar",
+                     "columnar snapshots are written from every object")
+    def test_save_dirty_only(self):
+        """Test that save only re-serializes objects changed since"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        storage.new(state)
+        storage.save()
+        key = "State." + state.id
+        object.__setattr__(state, "name", "Untracked")
+        storage.save()
+        self.assertEqual(snapshot()[key]["name"], "Vecindad")
+        state.name = "Mexico"
+        storage.save()
+        js = snapshot()
+        self.assertEqual(js[key], state.to_dict(save_fs=1))
+        expected = {k: v.to_dict(save_fs=1) for k, v in storage.all().items()}
+        self.assertEqual(js, expected)
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_items_streaming(self):
+        """Test that the streaming parser yields what json.load returns"""
+        items = FileStorage._FileStorage__items
+        text = json.dumps({"State.1": {"name": "}, \"x"}, "n": 12345,
+                           "City.2": {"ids": [1, {"a": []}]}}, indent=1)
+        for size in [1, 3, 64, 65536]:
+            with self.subTest(size=size):
+                with open("file_items.json", "w") as f:
+                    f.write(text)
+                with open("file_items.json", "r") as f:
+                    self.assertEqual(dict(items(f, size)), json.loads(text))
+        for text in ['{"a": 1', '{"a": 1,}', '[1]']:
+            with self.subTest(text=text):
+                with open("file_items.json", "w") as f:
+                    f.write(text)
+                with open("file_items.json", "r") as f:
+                    self.assertRaises(ValueError, dict, items(f, 2))
+        os.remove("file_items.json")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_parallel(self):
+        """Test that a reload split across workers builds every object"""
+        storage = FileStorage()
+        states = [State(name="State {}".format(i)) for i in range(50)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        FileStorage._FileStorage__reload_workers = 3
+        FileStorage._FileStorage__reload_parallel_min = 0
+        FileStorage._FileStorage__file_stat = None
+        try:
+            storage.reload()
+        finally:
+            FileStorage._FileStorage__reload_workers = 0
+            FileStorage._FileStorage__reload_parallel_min = 1048576
+        got = {k: v.to_dict() for k, v in storage.all().items()}
+        self.assertEqual(got, expected)
+        self.assertIsNot(storage.get(State, states[0].id), states[0])
+        for state in states:
+            storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_columnar(self):
+        """Test that a columnar snapshot reloads the same objects"""
+        storage = FileStorage()
+        place = Place(name="Casa", number_rooms=3, latitude=1.5,
+                      amenity_ids=["a", "b"])
+        storage.new(place)
+        storage.new(User(email="a@b.c", password="pwd"))
+        storage.save()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        attrs = ("format", "file_path", "journal_path")
+        saved = [getattr(FileStorage, "_FileStorage__" + a) for a in attrs]
+        values = ["columnar", "test_file.col", "test_file.col.log"]
+        for attr, value in zip(attrs, values):
+            setattr(FileStorage, "_FileStorage__" + attr, value)
+        try:
+            storage.compact()
+            with open("test_file.col", "rb") as f:
+                self.assertEqual(f.read(8), b"HBNBCOL1")
+            FileStorage._FileStorage__file_stat = None
+            storage.reload()
+            got = {k: v.to_dict() for k, v in storage.all().items()}
+        finally:
+            for attr, value in zip(attrs, saved):
+                setattr(FileStorage, "_FileStorage__" + attr, value)
+            os.remove("test_file.col")
+            FileStorage._FileStorage__file_stat = None
+        self.assertEqual(got, expected)
+        self.assertIs(type(storage.get(Place, place.id).created_at), datetime)
+        for obj in list(storage.all().values()):
+            if obj.id == place.id or getattr(obj, "email", "") == "a@b.c":
+                storage.delete(obj)
+        storage.save()
@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+"""
+Contains the TestMmapStorageDocs and TestMmapStorage classes
+"""
+
+import gc
+import inspect
+import json
+import models
+from models.engine import mmap_storage
+from models.city import City
+from models.state import State
+import os
+import pep8
+import unittest
+MmapStorage = mmap_storage.MmapStorage
+# class attributes of MmapStorage put back after each test
+state = ["file_path", "import_path", "cache_size", "map", "tables",
+         "file_stat", "changed", "cache", "live"]
+
+
+class TestMmapStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of MmapStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.ms_f = inspect.getmembers(MmapStorage, inspect.isfunction)
+
+    def test_pep8_conformance_mmap_storage(self):
+        """Test that models/engine/mmap_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/mmap_storage.py',
+                                    'tests/test_models/test_engine/\
+test_mmap_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_mmap_storage_docstrings(self):
+        """Test for the module, class and method docstrings"""
+        self.assertTrue(len(mmap_storage.__doc__) >= 1)
+        self.assertTrue(len(MmapStorage.__doc__) >= 1)
+        for func in self.ms_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing mmap storage")
+@unittest.skipIf(models.base_model.compact,
+                 "compact models can not be tracked through weakrefs")
+class TestMmapStorage(unittest.TestCase):
+    """Test the MmapStorage class"""
+    def setUp(self):
+        """Points MmapStorage at an empty test snapshot"""
+        self.saved = {a: getattr(MmapStorage, "_MmapStorage__" + a)
+                      for a in state}
+        for attr, value in [("file_path", "test_file.idx"),
+                            ("import_path", "test_file.json"),
+                            ("cache_size", 2), ("map", None),
+                            ("tables", None), ("file_stat", None),
+                            ("changed", {})]:
+            setattr(MmapStorage, "_MmapStorage__" + attr, value)
+        MmapStorage._MmapStorage__cache = type(self.saved["cache"])()
+        MmapStorage._MmapStorage__live = type(self.saved["live"])()
+        self.storage = MmapStorage()
+
+    def tearDown(self):
+        """Puts MmapStorage back as it was"""
+        if MmapStorage._MmapStorage__map is not None:
+            MmapStorage._MmapStorage__map.close()
+        for attr, value in self.saved.items():
+            setattr(MmapStorage, "_MmapStorage__" + attr, value)
+        for path in ["test_file.idx", "test_file.json"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def fresh(self):
+        """returns a storage that has only read the snapshot"""
+        MmapStorage._MmapStorage__changed = {}
+        MmapStorage._MmapStorage__file_stat = None
+        self.storage.reload()
+        return self.storage
+
+    def test_import_and_lazy_reload(self):
+        """Test that reload imports the JSON file and decodes nothing"""
+        states = [State(name=str(i)) for i in range(5)]
+        with open("test_file.json", "w") as f:
+            json.dump({"State." + s.id: s.to_dict() for s in states}, f)
+        self.storage.reload()
+        self.assertTrue(os.path.exists("test_file.idx"))
+        storage = self.fresh()
+        self.assertEqual(len(MmapStorage._MmapStorage__live), 0)
+        self.assertEqual(storage.count(State), 5)
+        self.assertEqual(storage.count(), 5)
+        self.assertEqual(len(MmapStorage._MmapStorage__live), 0)
+        obj = storage.get(State, states[3].id)
+        self.assertEqual(obj.to_dict(), states[3].to_dict())
+        self.assertIs(storage.get(State, states[3].id), obj)
+        self.assertIsNone(storage.get(State, "nope"))
+        self.assertEqual(len(storage.all(State)), 5)
+
+    def test_cache_eviction(self):
+        """Test that unreferenced objects are dropped past the cache size"""
+        ids = []
+        for i in range(5):
+            obj = State(name=str(i))
+            self.storage.new(obj)
+            ids.append(obj.id)
+        self.storage.save()
+        del obj
+        storage = self.fresh()
+        for id in ids:
+            storage.get(State, id)
+        gc.collect()
+        self.assertEqual(len(MmapStorage._MmapStorage__cache), 2)
+        self.assertEqual(len(MmapStorage._MmapStorage__live), 2)
+
+    def test_save_delete_related(self):
+        """Test that changes are written out and parents are indexed"""
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        storage = self.fresh()
+        self.assertEqual(storage.related(City, "state_id", state.id),
+                         [storage.get(City, city.id)])
+        other = City(name="Fresno", state_id=state.id)
+        storage.new(other)
+        storage.delete(storage.get(City, city.id))
+        storage.save()
+        storage = self.fresh()
+        self.assertEqual(storage.count(City), 1)
+        related = storage.related(City, "state_id", state.id)
+        self.assertEqual([c.name for c in related], ["Fresno"])
+        self.assertEqual(storage.get(State, state.id).name, "California")
+
+    def test_page(self):
+        """Test that pages merge saved and changed objects by id"""
+        state = State(name="Meta")
+        cities = [City(name=str(i), state_id=state.id) for i in range(4)]
+        for obj in [state] + cities:
+            self.storage.new(obj)
+        self.storage.save()
+        storage = self.fresh()
+        ids = sorted(c.id for c in cities)
+        storage.delete(storage.get(City, ids[1]))
+        extra = City(id=ids[0] + "0", state_id=state.id)
+        storage.new(extra)
+        found = storage.all(City, limit=2)
+        self.assertEqual(list(found), ["City." + ids[0], "City." + extra.id])
+        found = storage.all(City, after=(extra.id, extra.id))
+        self.assertEqual([obj.id for obj in found.values()], ids[2:])
+        found = storage.related(City, "state_id", state.id, limit=2,
+                                after=(ids[0], ids[0]))
+        self.assertEqual([obj.id for obj in found], [extra.id, ids[2]])
+        self.assertEqual(len(storage.all(City)), 4)
+
+    def test_version(self):
+        """Test that versions change with objects and other snapshots"""
+        tags = [self.storage.version(State)[0]]
+        state = State(name="Meta")
+        self.storage.new(state)
+        tags.append(self.storage.version(State)[0])
+        self.storage.save()
+        self.assertEqual(self.storage.version(State)[0], tags[-1])
+        MmapStorage._MmapStorage__file_stat = None
+        self.storage.reload()
+        tags.append(self.storage.version(State)[0])
+        self.storage.delete(self.storage.get(State, state.id))
+        tags.append(self.storage.version(State)[0])
+        self.assertEqual(len(set(tags)), 4)
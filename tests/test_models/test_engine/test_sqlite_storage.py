@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+import inspect
+from models.engine import sqlite_storage
+import os
+import pep8
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py',
+                                    'tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_docstrings(self):
+        """Test for the module, class and function docstrings"""
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1)
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1)
+        for name, func in inspect.getmembers(sqlite_storage,
+                                             inspect.isfunction):
+            self.assertIsNot(func.__doc__, None,
+                             "{:s} needs a docstring".format(name))
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class"""
+    def test_sqlite_storage(self):
+        """Test that the sqlite engine stores the db models in WAL mode"""
+        code = "\n".join([
+            "import models",
+            "from models.city import City",
+            "from models.state import State",
+            "assert models.storage_t == 'db'",
+            "state = State(name='California')",
+            "state.save()",
+            "City(name='Fresno', state_id=state.id).save()",
+            "models.storage.close()",
+            "state = models.storage.get(State, state.id)",
+            "assert [c.name for c in state.cities] == ['Fresno']",
+            "assert models.storage.count() == 2"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hbnb.db")
+            env = dict(os.environ, HBNB_TYPE_STORAGE="sqlite",
+                       HBNB_SQLITE_DB=path, HBNB_ENV="test")
+            subprocess.run([sys.executable, "-c", code], env=env, check=True)
+            con = sqlite3.connect(path)
+            try:
+                mode, = con.execute("PRAGMA journal_mode").fetchone()
+                indexes = {row[0] for row in con.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'")}
+            finally:
+                con.close()
+        self.assertEqual(mode, "wal")
+        for index in ["ix_cities_state_id", "ix_places_city_id",
+                      "ix_places_user_id", "ix_reviews_place_id",
+                      "ix_reviews_user_id", "ix_place_amenity_amenity_id"]:
+            self.assertIn(index, indexes)
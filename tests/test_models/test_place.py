@@ -7,7 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models import place
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attributes, compact
 import pep8
 import unittest
 Place = place.Place
@@ -177,7 +177,8 @@ class TestPlace(unittest.TestCase):
         new_d = p.to_dict()
         self.assertEqual(type(new_d), dict)
         self.assertFalse("_sa_instance_state" in new_d)
-        for attr in p.__dict__:
+        attrs = attributes(p) if compact else p.__dict__
+        for attr in attrs:
             if attr is not "_sa_instance_state":
                 self.assertTrue(attr in new_d)
         self.assertTrue("__class__" in new_d)
@@ -196,5 +197,6 @@ class TestPlace(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         place = Place()
-        string = "[Place] ({}) {}".format(place.id, place.__dict__)
+        attrs = attributes(place) if compact else place.__dict__
+        string = "[Place] ({}) {}".format(place.id, attrs)
         self.assertEqual(string, str(place))
@@ -7,7 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models import review
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attributes, compact
 import pep8
 import unittest
 Review = review.Review
@@ -100,7 +100,8 @@ class TestReview(unittest.TestCase):
         new_d = r.to_dict()
         self.assertEqual(type(new_d), dict)
         self.assertFalse("_sa_instance_state" in new_d)
-        for attr in r.__dict__:
+        attrs = attributes(r) if compact else r.__dict__
+        for attr in attrs:
             if attr is not "_sa_instance_state":
                 self.assertTrue(attr in new_d)
         self.assertTrue("__class__" in new_d)
@@ -119,5 +120,6 @@ class TestReview(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         review = Review()
-        string = "[Review] ({}) {}".format(review.id, review.__dict__)
+        attrs = attributes(review) if compact else review.__dict__
+        string = "[Review] ({}) {}".format(review.id, attrs)
         self.assertEqual(string, str(review))
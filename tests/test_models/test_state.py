@@ -7,7 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models import state
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attributes, compact
 import pep8
 import unittest
 State = state.State
@@ -82,7 +82,8 @@ class TestState(unittest.TestCase):
         new_d = s.to_dict()
         self.assertEqual(type(new_d), dict)
         self.assertFalse("_sa_instance_state" in new_d)
-        for attr in s.__dict__:
+        attrs = attributes(s) if compact else s.__dict__
+        for attr in attrs:
             if attr is not "_sa_instance_state":
                 self.assertTrue(attr in new_d)
         self.assertTrue("__class__" in new_d)
@@ -101,5 +102,6 @@ class TestState(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         state = State()
-        string = "[State] ({}) {}".format(state.id, state.__dict__)
+        attrs = attributes(state) if compact else state.__dict__
+        string = "[State] ({}) {}".format(state.id, attrs)
         self.assertEqual(string, str(state))
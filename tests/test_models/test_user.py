@@ -7,7 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models import user
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attributes, compact
 import pep8
 import unittest
 User = user.User
@@ -109,7 +109,8 @@ class TestUser(unittest.TestCase):
         new_d = u.to_dict()
         self.assertEqual(type(new_d), dict)
         self.assertFalse("_sa_instance_state" in new_d)
-        for attr in u.__dict__:
+        attrs = attributes(u) if compact else u.__dict__
+        for attr in attrs:
             if attr is not "_sa_instance_state":
                 self.assertTrue(attr in new_d)
         self.assertTrue("__class__" in new_d)
@@ -128,5 +129,6 @@ class TestUser(unittest.TestCase):
     def test_str(self):
         """test that the str method has the correct output"""
         user = User()
-        string = "[User] ({}) {}".format(user.id, user.__dict__)
+        attrs = attributes(user) if compact else user.__dict__
+        string = "[User] ({}) {}".format(user.id, attrs)
         self.assertEqual(string, str(user))
@@ -22,7 +22,7 @@ def close_db(error):
 @app.route('/1-hbnb/', strict_slashes=False)
 def hbnb():
     """ HBNB is alive! """
-    states = storage.all(State).values()
+    states = storage.eager(State, "cities").values()
     states = sorted(states, key=lambda k: k.name)
     st_ct = []
 
@@ -32,7 +32,7 @@ def hbnb():
     amenities = storage.all(Amenity).values()
     amenities = sorted(amenities, key=lambda k: k.name)
 
-    places = storage.all(Place).values()
+    places = storage.eager(Place, "user").values()
     places = sorted(places, key=lambda k: k.name)
 
     return render_template('1-hbnb.html',
@@ -22,7 +22,7 @@ def close_db(error):
 @app.route('/3-hbnb/', strict_slashes=False)
 def hbnb():
     """ HBNB is alive! """
-    states = storage.all(State).values()
+    states = storage.eager(State, "cities").values()
     states = sorted(states, key=lambda k: k.name)
     st_ct = []
 
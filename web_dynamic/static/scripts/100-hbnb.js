@@ -8,14 +8,14 @@ $(document).ready(function () {
     }
   });
 
-  // Get all places
-  $.ajax({
-    type: 'POST',
-    url: 'http://0.0.0.0:5001/api/v1/places_search/',
-    contentType: 'application/json',
-    data: '{}',
-    dataType: 'json',
-    success: fetchPlaces
+  // Get the first page of places, then the next ones while scrolling
+  searchPlaces({});
+
+  $(window).on('scroll', function () {
+    if ($(window).scrollTop() + $(window).height() >
+        $(document).height() - 200) {
+      nextPlaces();
+    }
   });
 
   $('input:checkbox:checked').prop('checked', false);
@@ -69,23 +69,66 @@ $(document).ready(function () {
 
   // Filter places by amenities
   $('button').on('click', function () {
-    $.ajax({
-      type: 'POST',
-      url: 'http://0.0.0.0:5001/api/v1/places_search/',
-      contentType: 'application/json',
-      data: JSON.stringify({
-        amenities: Object.keys(amenities),
-        states: Object.keys(states),
-        cities: Object.keys(cities)
-      }),
-      dataType: 'json',
-      success: fetchPlaces
+    searchPlaces({
+      amenities: Object.keys(amenities),
+      states: Object.keys(states),
+      cities: Object.keys(cities)
     });
   });
 });
 
-function fetchPlaces (data) {
+const PAGE_SIZE = 50;
+// The attributes of places shown by fetchPlaces
+const PLACE_FIELDS = ['name', 'price_by_night', 'max_guest', 'number_rooms',
+  'number_bathrooms', 'description'];
+let search = null;
+let nextCursor = null;
+let loading = false;
+
+// Search places matching filters from the first page
+function searchPlaces (filters) {
+  search = filters;
+  nextCursor = null;
   $('section.places').empty();
+  fetchPage(filters);
+}
+
+// Append the page of places after the last one fetched, if any
+function nextPlaces () {
+  if (nextCursor !== null && !loading) {
+    fetchPage(search, nextCursor);
+  }
+}
+
+function fetchPage (filters, cursor) {
+  const body = Object.assign({ limit: PAGE_SIZE, fields: PLACE_FIELDS },
+    filters);
+  if (cursor) {
+    body.cursor = cursor;
+  }
+  loading = true;
+  $.ajax({
+    type: 'POST',
+    url: 'http://0.0.0.0:5001/api/v1/places_search/',
+    contentType: 'application/json',
+    data: JSON.stringify(body),
+    dataType: 'json',
+    success: function (data, status, xhr) {
+      if (filters !== search) {
+        return;
+      }
+      nextCursor = xhr.getResponseHeader('X-Next-Cursor');
+      fetchPlaces(data);
+    },
+    complete: function () {
+      if (filters === search) {
+        loading = false;
+      }
+    }
+  });
+}
+
+function fetchPlaces (data) {
   $('section.places').append(data.map(place => {
     return `<article>
               <div class="title_box">
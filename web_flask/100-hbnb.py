@@ -21,7 +21,7 @@ def close_db(error):
 @app.route('/hbnb', strict_slashes=False)
 def hbnb():
     """ HBNB is alive! """
-    states = storage.all(State).values()
+    states = storage.eager(State, "cities").values()
     states = sorted(states, key=lambda k: k.name)
     st_ct = []
 
@@ -31,7 +31,7 @@ def hbnb():
     amenities = storage.all(Amenity).values()
     amenities = sorted(amenities, key=lambda k: k.name)
 
-    places = storage.all(Place).values()
+    places = storage.eager(Place, "user").values()
     places = sorted(places, key=lambda k: k.name)
 
     return render_template('100-hbnb.html',
@@ -26,7 +26,7 @@ def states_list():
 @app.route('/cities_by_states', strict_slashes=False)
 def cities_list():
     """ displays a HTML page with a list of cities by states """
-    states = storage.all(State).values()
+    states = storage.eager(State, "cities").values()
     states = sorted(states, key=lambda k: k.name)
     st_ct = []
     for state in states: